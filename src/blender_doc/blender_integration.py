@@ -1,332 +1,1447 @@
 """Blender integration for headless operations."""
 
+import hashlib
+import os
+import sqlite3
+import struct
 import subprocess
 import json
-import tempfile
+import logging
+import queue
+import re
+import shutil
+import signal
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Callable, Deque, Dict, Any, Generator, Iterator, List, Optional, Set, Tuple
 import sys
 
 from .data_structures import BlendFileMetadata
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-class BlenderIntegration:
-    """Handles headless Blender operations."""
+logger = logging.getLogger(__name__)
+
+
+# Driver script run inside a persistent Blender process. It reads one JSON
+# request per line from stdin and answers each with a stream of JSON lines on
+# a result pipe (or stdout), the last one marked "done", so Blender only has
+# to start up once per BlenderIntegration. It is passed with --python-expr,
+# so keep it well below the Windows command line limit (32767 characters).
+_WORKER_SCRIPT = """
+import bpy
+import json
+import os
+import sys
+
+# Blender's bundled Python usually doesn't have orjson, but use it if it does
+try:
+    import orjson
+
+    def dumps(obj):
+        return orjson.dumps(obj).decode()
+    loads = orjson.loads
+except ImportError:
+    dumps = json.dumps
+    loads = json.loads
+
+
+def resolve_path(path_str, base_dir):
+    \"\"\"Make a path absolute, handling Blender relative paths.\"\"\"
+    if not path_str:
+        return None
+    # Blender uses // for relative paths
+    if path_str.startswith('//'):
+        path_str = base_dir + os.sep + path_str[2:]
+    # Make absolute if relative
+    elif not os.path.isabs(path_str):
+        path_str = base_dir + os.sep + path_str
+    # Only a lexical cleanup - resolving symlinks and checking existence
+    # touch the disk, so they are left to the host to keep this process
+    # free for the next file
+    return os.path.normpath(path_str)
+
+
+def count_metadata(fields=None):
+    # Count objects
+    object_count = len(bpy.data.objects)
+    scene_count = len(bpy.data.scenes)
+    material_count = len(bpy.data.materials)
+
+    # Count meshes and vertices. The other counts are a single call each,
+    # but vertices mean walking every mesh, so only do it when asked
+    mesh_count = len(bpy.data.meshes)
+    total_vertex_count = 0
+    if fields is None or 'total_vertex_count' in fields:
+        for mesh in bpy.data.meshes:
+            total_vertex_count += len(mesh.vertices)
+
+    return {
+        "object_count": object_count,
+        "scene_count": scene_count,
+        "material_count": material_count,
+        "mesh_count": mesh_count,
+        "total_vertex_count": total_vertex_count,
+    }
+
+
+def iter_references(blend_path):
+    # Yields (path, must_exist) for every external file reference, possibly
+    # more than once
+    blend_dir = os.path.dirname(os.path.abspath(blend_path))
+
+    # The same library is usually referenced by many datablocks - only
+    # resolve (and stat) each raw filepath the first time it is seen
+    unresolved_seen = set()
+
+    def resolve(path_str):
+        if path_str in unresolved_seen:
+            return None
+        unresolved_seen.add(path_str)
+        return resolve_path(path_str, blend_dir)
+
+    data = bpy.data
+    objects = data.objects
+
+    # Every ID type has .library (None unless linked), so no hasattr probes
+    # are needed below
+
+    # 1. Check for linked libraries (primary source)
+    for library in data.libraries:
+        filepath = library.filepath
+        if filepath:
+            lib_path = resolve(filepath)
+            if lib_path:
+                yield lib_path, False
+
+    # 2. Check for linked objects directly
+    for obj in objects:
+        # Objects can be linked from another file
+        lib = obj.library
+        if lib is not None:
+            lib_path = resolve(lib.filepath)
+            if lib_path:
+                yield lib_path, False
+
+        # Check object data (mesh, curve, etc) - None for empties
+        obj_data = obj.data
+        if obj_data is not None:
+            lib = obj_data.library
+            if lib is not None:
+                lib_path = resolve(lib.filepath)
+                if lib_path:
+                    yield lib_path, False
+
+    # 3-4. Check for linked collections and materials
+    for ids in (data.collections, data.materials):
+        for id_block in ids:
+            lib = id_block.library
+            if lib is not None:
+                lib_path = resolve(lib.filepath)
+                if lib_path:
+                    yield lib_path, False
+
+    # 5. Check for image textures
+    for image in data.images:
+        filepath = image.filepath
+        if filepath and not image.packed_file:
+            img_path = resolve(filepath)
+            if img_path:
+                yield img_path, True
+
+    # 6-7. Check for linked actions (animations) and node trees (shader,
+    # compositor, geometry)
+    for ids in (data.actions, data.node_groups):
+        for id_block in ids:
+            lib = id_block.library
+            if lib is not None:
+                lib_path = resolve(lib.filepath)
+                if lib_path:
+                    yield lib_path, False
+
+    # 8. Check particle systems for external dependencies
+    for obj in objects:
+        for ps in obj.particle_systems:
+            settings = ps.settings
+            if settings is None:
+                continue
+            coll = settings.instance_collection
+            if coll is not None:
+                lib = coll.library
+                if lib is not None:
+                    lib_path = resolve(lib.filepath)
+                    if lib_path:
+                        yield lib_path, False
+
+    # 9. Check for linked meshes, curves, etc
+    for ids in (data.meshes, data.curves):
+        for id_block in ids:
+            lib = id_block.library
+            if lib is not None:
+                lib_path = resolve(lib.filepath)
+                if lib_path:
+                    yield lib_path, False
+
+
+def iter_dependencies(blend_path):
+    seen = set()
+    for path, must_exist in iter_references(blend_path):
+        if path not in seen:
+            seen.add(path)
+            yield path, must_exist
+
+
+def extract_all(blend_path, fields=None):
+    # Open the file once and run both passes on it. Dependencies are sent
+    # as they are found, followed by a final frame with the metadata
+    try:
+        bpy.ops.wm.open_mainfile(filepath=blend_path)
+    except Exception as e:
+        yield {"meta": None, "error": str(e), "done": True}
+        return
+
+    for path, must_exist in iter_dependencies(blend_path):
+        yield {"dep": path, "must_exist": must_exist}
+
+    yield {"meta": count_metadata(fields), "error": None, "done": True}
+
+
+def extract_metadata(blend_path, fields=None):
+    try:
+        bpy.ops.wm.open_mainfile(filepath=blend_path)
+    except Exception as e:
+        yield {"meta": None, "error": str(e), "done": True}
+        return
+
+    yield {"meta": count_metadata(fields), "error": None, "done": True}
+
+
+HANDLERS = {
+    'all': extract_all,
+    'meta': extract_metadata,
+}
+
+# Results go to a pipe of their own when the host provides one (POSIX).
+# Otherwise they share stdout with Blender, so they are wrapped in ASCII
+# record separators to tell them apart from anything Blender prints
+RS = "\\x1e"
+RESULT_FD = os.environ.get('BLENDER_DOC_RESULT_FD')
+if RESULT_FD:
+    results = os.fdopen(int(RESULT_FD), 'w', encoding='utf-8')
+else:
+    results = sys.stdout
+
+
+def write_frame(frame):
+    results.write(RS + dumps(frame) + RS + "\\n")
+    results.flush()
+
+
+def handle(op, path, fields=None):
+    try:
+        for frame in HANDLERS[op](path, fields):
+            write_frame(frame)
+    except Exception as e:
+        write_frame({"error": str(e), "done": True})
+
+
+if '--' in sys.argv:
+    # Batch mode: answer for each file listed after "--", starting from a
+    # clean state every time, then exit
+    for path in sys.argv[sys.argv.index('--') + 1:]:
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+        handle('all', path)
+else:
+    while True:
+        line = sys.stdin.readline()
+        if not line:
+            break
+        request = loads(line)
+        if request['op'] == 'quit':
+            break
+        handle(request['op'], request['path'], request.get('fields'))
+"""
+
+
+# Delimits result frames written by _WORKER_SCRIPT (ASCII record separator)
+_RESULT_SEPARATOR = '\x1e'
+
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize to a JSON string, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def _json_loads(text: str) -> Any:
+    """Parse a JSON string, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+# Block codes counted by BlenderIntegration._fast_metadata
+_BLOCK_COUNTERS = {
+    b'OB\0\0': 'object_count',
+    b'SC\0\0': 'scene_count',
+    b'MA\0\0': 'material_count',
+    b'ME\0\0': 'mesh_count',
+}
+
+# Longest command line a batch is started with. Windows allows 32767
+# characters; POSIX systems have ARG_MAX, usually much more.
+_MAX_COMMAND_LINE = 32000
+
+
+def _command_line_chunks(base_cmd: List[str], paths: List[Path]) -> Iterator[List[Path]]:
+    """
+    Split paths into runs that fit on one command line after base_cmd.
+    
+    Lengths are measured as Windows quotes the arguments, which is never
+    shorter than the POSIX argument list. A path too long to share a command
+    line still gets one of its own.
+    """
+    budget = _MAX_COMMAND_LINE - len(subprocess.list2cmdline(base_cmd))
+    chunk: List[Path] = []
+    used = 0
+    for path in paths:
+        length = len(subprocess.list2cmdline([str(path)])) + 1
+        if chunk and used + length > budget:
+            yield chunk
+            chunk, used = [], 0
+        chunk.append(path)
+        used += length
+    if chunk:
+        yield chunk
+
+
+# Magic bytes of compressed .blend files (gzip, zstd)
+_COMPRESSED_MAGIC = (b'\x1f\x8b', b'\x28\xb5\x2f\xfd')
+
+
+# Dependency paths reported by the worker are normalized and checked here,
+# in parallel, instead of inside the Blender process
+_PATH_CHECK_POOL = ThreadPoolExecutor(max_workers=32, thread_name_prefix='blender_doc_paths')
+
+
+@lru_cache(maxsize=65536)
+def _normalize_dependency(path_str: str, must_exist: bool) -> Optional[str]:
+    """
+    Normalize a dependency path reported by the worker.
+    
+    Shared assets are referenced by many blend files, so results are cached:
+    each path is resolved (and checked) once per run rather than once per file.
+    
+    Args:
+        path_str: Absolute (but not normalized) path
+        must_exist: Drop the path if it doesn't exist (image textures)
+    
+    Returns:
+        Resolved path, or None if it should be skipped
+    """
+    try:
+        resolved = str(Path(path_str).resolve(strict=False))
+    except (OSError, RuntimeError):
+        return None
+    if must_exist and not os.path.exists(resolved):
+        return None
+    return resolved
+
+
+def _parse_sdna(dna: bytes, order: str) -> Optional[Tuple[List[str], List[int], List[tuple]]]:
+    """
+    Parse the SDNA block that describes the struct layouts in a .blend file.
+    
+    Args:
+        dna: Contents of the DNA1 block
+        order: struct byte order prefix ('<' or '>')
+    
+    Returns:
+        Tuple of (field names, type lengths, structs) where each struct is
+        (type index, [(field type index, field name index), ...]), or None
+        if the block is malformed
+    """
+    def align(pos: int) -> int:
+        return (pos + 3) & ~3
+    
+    def read_strings(pos: int, count: int) -> Tuple[List[str], int]:
+        strings = []
+        for _ in range(count):
+            end = dna.index(b'\0', pos)
+            strings.append(dna[pos:end].decode('latin-1'))
+            pos = end + 1
+        return strings, pos
+    
+    try:
+        if dna[0:8] != b'SDNANAME':
+            return None
+        (name_count,) = struct.unpack_from(order + 'i', dna, 8)
+        names, pos = read_strings(12, name_count)
+        
+        pos = align(pos)
+        if dna[pos:pos + 4] != b'TYPE':
+            return None
+        (type_count,) = struct.unpack_from(order + 'i', dna, pos + 4)
+        _, pos = read_strings(pos + 8, type_count)
+        
+        pos = align(pos)
+        if dna[pos:pos + 4] != b'TLEN':
+            return None
+        type_lengths = list(struct.unpack_from(f'{order}{type_count}H', dna, pos + 4))
+        pos = align(pos + 4 + 2 * type_count)
+        
+        if dna[pos:pos + 4] != b'STRC':
+            return None
+        (struct_count,) = struct.unpack_from(order + 'i', dna, pos + 4)
+        pos += 8
+        structs = []
+        for _ in range(struct_count):
+            type_index, field_count = struct.unpack_from(order + 'hh', dna, pos)
+            fields = struct.unpack_from(f'{order}{2 * field_count}h', dna, pos + 4)
+            structs.append((type_index, list(zip(fields[0::2], fields[1::2]))))
+            pos += 4 + 4 * field_count
+    except (ValueError, struct.error):
+        return None
     
-    def __init__(self, blender_exe: Optional[str] = None):
+    return names, type_lengths, structs
+
+
+def _sdna_field_offset(
+    sdna: Tuple[List[str], List[int], List[tuple]],
+    struct_index: int,
+    field_names: Tuple[str, ...],
+    pointer_size: int,
+) -> Optional[int]:
+    """
+    Find the byte offset of a field within a struct described by SDNA.
+    
+    Args:
+        sdna: Parsed SDNA from _parse_sdna()
+        struct_index: Index of the struct (a block's SDNAnr)
+        field_names: Accepted names for the field (first match wins)
+        pointer_size: Pointer size of the file (4 or 8)
+    
+    Returns:
+        Offset in bytes, or None if the struct has no such field
+    """
+    names, type_lengths, structs = sdna
+    if not 0 <= struct_index < len(structs):
+        return None
+    
+    offset = 0
+    for type_index, name_index in structs[struct_index][1]:
+        name = names[name_index]
+        base_name = re.match(r'[(*]*(\w*)', name).group(1)
+        if base_name in field_names and not name.startswith(('*', '(')):
+            return offset
+        
+        count = 1
+        for dim in re.findall(r'\[(\d+)\]', name):
+            count *= int(dim)
+        if name.startswith('(*'):
+            offset += pointer_size
+        elif name.startswith('*'):
+            offset += pointer_size * count
+        else:
+            offset += type_lengths[type_index] * count
+    
+    return None
+
+
+class _BlenderWorker:
+    """A persistent Blender process answering JSON requests over pipes."""
+    
+    def __init__(self, cmd: List[str], timeout: float):
         """
-        Initialize Blender integration.
+        Launch the worker process.
         
         Args:
-            blender_exe: Path to Blender executable. If None, will search in PATH.
+            cmd: Command line starting Blender with the worker script
+            timeout: Seconds to wait for Blender to answer a single request
         """
-        self.blender_exe = blender_exe or self._find_blender()
-        if not self.blender_exe:
-            raise RuntimeError(
-                "Blender executable not found. Please install Blender 5.0+ or "
-                "specify the path with --blender-path argument."
+        self.timeout = timeout
+        
+        if os.name == 'posix':
+            # Give the worker a pipe of its own for results, so Blender's
+            # chatter on stdout can be discarded instead of scanned
+            read_fd, write_fd = os.pipe()
+            try:
+                self.process = subprocess.Popen(
+                    cmd,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                    bufsize=1,
+                    pass_fds=(write_fd,),
+                    env={**os.environ, 'BLENDER_DOC_RESULT_FD': str(write_fd)},
+                    # Own process group, so a hung worker can be killed
+                    # together with anything it started
+                    start_new_session=True,
+                )
+            except BaseException:
+                os.close(read_fd)
+                raise
+            finally:
+                os.close(write_fd)
+            results = open(read_fd, 'r', encoding='utf-8')
+        else:
+            self.process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                encoding='utf-8',
+                bufsize=1,
+                creationflags=subprocess.CREATE_NEW_PROCESS_GROUP,
             )
+            results = self.process.stdout
+        
+        # Drain results on a background thread so reads can time out
+        self._output: queue.Queue = queue.Queue()
+        threading.Thread(
+            target=self._pump_output,
+            args=(results, self._output),
+            daemon=True,
+        ).start()
+    
+    @property
+    def alive(self) -> bool:
+        """Whether the worker process is still running."""
+        return self.process.poll() is None
     
     @staticmethod
-    def _find_blender() -> Optional[str]:
-        """Try to find Blender executable in PATH."""
-        import shutil
-        
-        for exe_name in ['blender', 'blender.exe']:
-            path = shutil.which(exe_name)
-            if path:
-                return path
-        return None
+    def _pump_output(stream, output: queue.Queue) -> None:
+        """Forward lines from the worker's result stream into a queue (None on EOF)."""
+        with stream:
+            for line in stream:
+                output.put(line)
+        output.put(None)
     
-    def extract_blend_dependencies(self, blend_file_path: Path) -> List[str]:
+    def stream(
+        self,
+        op: str,
+        blend_file_path: Path,
+        fields: Optional[List[str]] = None,
+    ) -> Generator[Dict[str, Any], None, None]:
         """
-        Extract external file references from a Blend file.
+        Send one request to the worker and yield its answer frame by frame.
+        
+        The last frame yielded is the one marked "done" (see receive()).
+        
+        Args:
+            op: Operation name understood by the worker script ('all' or 'meta')
+            blend_file_path: Path to blend file to operate on
+            fields: Metadata fields to compute (None for all)
+        
+        Yields:
+            Decoded JSON frames from the worker
+        
+        Raises:
+            subprocess.TimeoutExpired: If Blender does not answer in time
+            RuntimeError: If the worker exits before answering
+        """
+        request = {'op': op, 'path': str(blend_file_path)}
+        if fields is not None:
+            request['fields'] = fields
+        self.process.stdin.write(_json_dumps(request) + "\n")
+        self.process.stdin.flush()
+        yield from self.receive()
+    
+    def receive(self) -> Generator[Dict[str, Any], None, None]:
+        """
+        Yield the frames of the next answer from the worker, up to the one marked "done".
+        
+        If the caller stops early, the rest of the answer is read and
+        discarded so the worker is ready for the next request.
+        
+        Yields:
+            Decoded JSON frames from the worker
+        
+        Raises:
+            subprocess.TimeoutExpired: If Blender does not answer in time
+            RuntimeError: If the worker exits before answering
+        """
+        deadline = time.monotonic() + self.timeout
+        done = False
+        try:
+            while not done:
+                frame = self._read_frame(deadline)
+                done = bool(frame.get('done'))
+                yield frame
+        finally:
+            if not done and self.alive:
+                while not self._read_frame(deadline).get('done'):
+                    pass
+    
+    def _read_frame(self, deadline: float) -> Dict[str, Any]:
+        """
+        Wait for the next result frame from the worker.
+        
+        Args:
+            deadline: time.monotonic() value after which the worker is considered hung
+        
+        Returns:
+            Decoded JSON frame
+        
+        Raises:
+            subprocess.TimeoutExpired: If Blender does not answer in time
+            RuntimeError: If the worker exits before answering
+        """
+        while True:
+            try:
+                line = self._output.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                # A hung worker can't be reused - kill it so the caller restarts it
+                self._kill()
+                raise subprocess.TimeoutExpired(self.process.args, self.timeout)
+            
+            if line is None:
+                self.process.wait()
+                raise RuntimeError("Blender worker exited unexpectedly")
+            
+            # Skip Blender's own output (startup banner, "Read blend:" etc) -
+            # the frame is the text between the last two separators
+            end = line.rfind(_RESULT_SEPARATOR)
+            start = line.rfind(_RESULT_SEPARATOR, 0, end) if end > 0 else -1
+            if start >= 0:
+                return _json_loads(line[start + 1:end])
+    
+    def close(self) -> None:
+        """Ask the worker to quit, killing it if it doesn't."""
+        try:
+            if self.alive:
+                self.process.stdin.write(_json_dumps({'op': 'quit'}) + "\n")
+                self.process.stdin.flush()
+                self.process.stdin.close()
+                self.process.wait(timeout=10)
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            self._kill()
+    
+    def _kill(self) -> None:
+        """Kill the worker's whole process group and wait for it to exit."""
+        if os.name == 'posix':
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        else:
+            try:
+                self.process.send_signal(signal.CTRL_BREAK_EVENT)
+            except OSError:
+                pass
+            self.process.kill()
+        self.process.wait()
+
+
+class _BlenderBatch(_BlenderWorker):
+    """A one-off Blender process working through the files listed on its command line."""
+    
+    def stream(
+        self,
+        op: str,
+        blend_file_path: Path,
+        fields: Optional[List[str]] = None,
+    ) -> Generator[Dict[str, Any], None, None]:
+        """
+        Yield the answer for the next file on the command line.
+        
+        Nothing is sent to the process - callers must ask for the files in
+        the order they were listed.
+        
+        Args:
+            op: Ignored, batches always run the 'all' operation
+            blend_file_path: Path to blend file (for the caller's reference only)
+            fields: Ignored, batches always compute all fields
+        
+        Yields:
+            Decoded JSON frames from the worker
+        """
+        return self.receive()
+
+
+class _CacheStore:
+    """On-disk cache of Blender extraction results keyed by file fingerprint."""
+    
+    DEFAULT_PATH = Path.home() / '.cache' / 'blender_doc' / 'cache.sqlite'
+    
+    # Bump whenever the stored columns change - older tables are dropped
+    SCHEMA_VERSION = 2
+    
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Open (or create) the cache database.
+        
+        Args:
+            db_path: Location of the sqlite file. Defaults to ~/.cache/blender_doc/cache.sqlite
+        """
+        db_path = Path(db_path or self.DEFAULT_PATH)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Shared by the extract_many() worker threads
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+        if version != self.SCHEMA_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS blend_cache")
+            self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS blend_cache ("
+            "path TEXT PRIMARY KEY, mtime REAL, size INT, sha1 TEXT, "
+            "meta_json TEXT, refs_json TEXT)"
+        )
+        self._conn.commit()
+    
+    def get(self, blend_file_path: Path) -> Optional[Tuple[Dict[str, Any], List[Tuple[str, bool]]]]:
+        """
+        Look up cached results for a file.
         
         Args:
             blend_file_path: Path to .blend file
         
         Returns:
-            List of external file paths referenced in the blend file
+            Tuple of (metadata dict, references), or None if missing or the file has changed
         """
-        script = """
-import bpy
-import json
-import sys
-from pathlib import Path
+        key = os.path.abspath(blend_file_path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            return None
+        
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT mtime, size, sha1, meta_json, refs_json FROM blend_cache WHERE path = ?",
+                (key,),
+            ).fetchone()
+        
+        if row is None or row[3] is None or row[4] is None:
+            return None
+        mtime, size, sha1, meta_json, refs_json = row
+        
+        if size != st.st_size:
+            return None
+        if mtime != st.st_mtime:
+            # Same size but a different mtime (touched, copied, checked out) -
+            # only hash the file in this case, to keep the common hit cheap
+            if sha1 != self._sha1(key):
+                return None
+            with self._lock:
+                self._conn.execute(
+                    "UPDATE blend_cache SET mtime = ? WHERE path = ?", (st.st_mtime, key)
+                )
+                self._conn.commit()
+        
+        return _json_loads(meta_json), [tuple(ref) for ref in _json_loads(refs_json)]
+    
+    def put(
+        self,
+        blend_file_path: Path,
+        meta: Dict[str, Any],
+        references: List[Tuple[str, bool]],
+    ) -> None:
+        """
+        Store results for the current version of a file.
+        
+        Args:
+            blend_file_path: Path to .blend file
+            meta: Metadata counts extracted by Blender
+            references: (path, must_exist) pairs as the worker reported them,
+                before normalization, so whether a referenced file exists is
+                checked again on every lookup
+        """
+        key = os.path.abspath(blend_file_path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            return
+        sha1 = self._sha1(key)
+        
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO blend_cache "
+                "(path, mtime, size, sha1, meta_json, refs_json) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, st.st_mtime, st.st_size, sha1, _json_dumps(meta), _json_dumps(references)),
+            )
+            self._conn.commit()
+    
+    def invalidate(self, blend_file_path: Path) -> None:
+        """Drop any cached results for a file."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM blend_cache WHERE path = ?", (os.path.abspath(blend_file_path),)
+            )
+            self._conn.commit()
+    
+    @staticmethod
+    def _sha1(path: str) -> str:
+        """Hash a file's contents."""
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
 
-blend_path = sys.argv[-1]
-blend_dir = str(Path(blend_path).parent)
 
-try:
-    bpy.ops.wm.open_mainfile(filepath=blend_path)
-except Exception as e:
-    print(json.dumps({"error": str(e), "external_files": []}))
-    sys.exit(0)
+@lru_cache(maxsize=1)
+def _find_blender() -> Optional[str]:
+    """Try to find Blender executable in PATH (looked up once per process)."""
+    for exe_name in ['blender', 'blender.exe']:
+        path = shutil.which(exe_name)
+        if path:
+            return path
+    return None
 
-external_files = set()
 
-def resolve_path(path_str, base_dir):
-    \"\"\"Resolve a path, handling Blender relative paths.\"\"\"
-    if not path_str:
-        return None
-    # Blender uses // for relative paths
-    if path_str.startswith('//'):
-        path_str = str(Path(base_dir) / path_str[2:])
-    # Make absolute if relative
-    if not Path(path_str).is_absolute():
-        path_str = str(Path(base_dir) / path_str)
+@lru_cache(maxsize=None)
+def _blender_version(blender_exe: str, mtime: float) -> Optional[Tuple[int, ...]]:
+    """
+    Ask Blender for its version.
+    
+    Cached per executable; the mtime is part of the key so an upgraded
+    binary at the same path is asked again.
+    
+    Args:
+        blender_exe: Path to Blender executable
+        mtime: Modification time of the executable
+    
+    Returns:
+        Version tuple such as (5, 0, 0), or None if it couldn't be read
+    """
     try:
-        # Normalize the path
-        resolved = str(Path(path_str).resolve())
-        return resolved
-    except:
+        result = subprocess.run(
+            [blender_exe, '--version'],
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    
+    match = re.search(r'Blender (\d+)\.(\d+)(?:\.(\d+))?', result.stdout)
+    if not match:
         return None
+    return tuple(int(part) for part in match.groups(default='0'))
 
-# 1. Check for linked libraries (primary source)
-for library in bpy.data.libraries:
-    if library.filepath:
-        lib_path = resolve_path(library.filepath, blend_dir)
-        if lib_path:
-            external_files.add(lib_path)
-
-# 2. Check for linked objects directly
-for obj in bpy.data.objects:
-    # Objects can be linked from another file
-    if obj.library:
-        lib_path = resolve_path(obj.library.filepath, blend_dir)
-        if lib_path:
-            external_files.add(lib_path)
-    
-    # Check object data (mesh, curve, etc)
-    if hasattr(obj, 'data') and obj.data:
-        if hasattr(obj.data, 'library') and obj.data.library:
-            lib_path = resolve_path(obj.data.library.filepath, blend_dir)
-            if lib_path:
-                external_files.add(lib_path)
-
-# 3. Check for linked collections
-for collection in bpy.data.collections:
-    if collection.library:
-        lib_path = resolve_path(collection.library.filepath, blend_dir)
-        if lib_path:
-            external_files.add(lib_path)
-
-# 4. Check for linked materials
-for material in bpy.data.materials:
-    if material.library:
-        lib_path = resolve_path(material.library.filepath, blend_dir)
-        if lib_path:
-            external_files.add(lib_path)
-
-# 5. Check for image textures
-for image in bpy.data.images:
-    if image.filepath and not image.packed_file:
-        img_path = resolve_path(image.filepath, blend_dir)
-        if img_path and Path(img_path).exists():
-            external_files.add(img_path)
-
-# 6. Check for linked actions (animations)
-for action in bpy.data.actions:
-    if action.library:
-        lib_path = resolve_path(action.library.filepath, blend_dir)
-        if lib_path:
-            external_files.add(lib_path)
-
-# 7. Check for linked node trees (shader, compositor, geometry)
-for node_tree in bpy.data.node_groups:
-    if node_tree.library:
-        lib_path = resolve_path(node_tree.library.filepath, blend_dir)
-        if lib_path:
-            external_files.add(lib_path)
-
-# 8. Check particle systems for external dependencies
-for obj in bpy.data.objects:
-    if hasattr(obj, 'particle_systems'):
-        for ps in obj.particle_systems:
-            if hasattr(ps, 'settings') and hasattr(ps.settings, 'instance_collection'):
-                if ps.settings.instance_collection:
-                    coll = ps.settings.instance_collection
-                    if hasattr(coll, 'library') and coll.library:
-                        lib_path = resolve_path(coll.library.filepath, blend_dir)
-                        if lib_path:
-                            external_files.add(lib_path)
-
-# 9. Check for linked meshes, curves, etc
-for mesh in bpy.data.meshes:
-    if hasattr(mesh, 'library') and mesh.library:
-        lib_path = resolve_path(mesh.library.filepath, blend_dir)
-        if lib_path:
-            external_files.add(lib_path)
-
-for curve in bpy.data.curves:
-    if hasattr(curve, 'library') and curve.library:
-        lib_path = resolve_path(curve.library.filepath, blend_dir)
-        if lib_path:
-            external_files.add(lib_path)
-
-# Convert to sorted list
-external_files = sorted(list(external_files))
-
-print(json.dumps({"external_files": external_files, "error": None}))
-"""
-        return self._run_blender_script(script, blend_file_path)
+
+class BlenderIntegration:
+    """Handles headless Blender operations."""
     
-    def extract_blend_metadata(self, blend_file_path: Path) -> BlendFileMetadata:
+    def __init__(
+        self,
+        blender_exe: Optional[str] = None,
+        timeout: float = 120,
+        use_cache: bool = True,
+    ):
+        """
+        Initialize Blender integration.
+        
+        Args:
+            blender_exe: Path to Blender executable. If None, will search in PATH.
+            timeout: Seconds to wait for Blender to answer a single request
+            use_cache: Reuse results for unchanged blend files from the on-disk cache
+        """
+        self.blender_exe = blender_exe or _find_blender()
+        if not self.blender_exe:
+            raise RuntimeError(
+                "Blender executable not found. Please install Blender 5.0+ or "
+                "specify the path with --blender-path argument."
+            )
+        self.timeout = timeout
+        
+        # Persistent worker state (started lazily on first request)
+        self._worker: Optional[_BlenderWorker] = None
+        # Idle workers kept between extract_many() calls, so a run of
+        # several calls starts Blender once per worker rather than per call
+        self._pool: List[_BlenderWorker] = []
+        
+        # Most recent extract_blend_all() result, as (path, result)
+        self._last_result: Optional[Tuple[Path, Tuple[BlendFileMetadata, List[str]]]] = None
+        
+        self._cache: Optional[_CacheStore] = None
+        if use_cache:
+            try:
+                self._cache = _CacheStore()
+            except (OSError, sqlite3.Error) as e:
+                logger.warning("Blender result cache unavailable: %s", e)
+    
+    @property
+    def version(self) -> Optional[Tuple[int, ...]]:
+        """Blender version as a tuple, e.g. (5, 0, 0), or None if it can't be determined."""
+        try:
+            mtime = os.stat(self.blender_exe).st_mtime
+        except OSError:
+            return None
+        return _blender_version(str(self.blender_exe), mtime)
+    
+    def extract_blend_dependencies(self, blend_file_path: Path) -> Iterator[str]:
+        """
+        Extract external file references from a Blend file.
+        
+        Paths are yielded as Blender finds them, so callers can start on
+        them before the whole file has been walked.
+        
+        Args:
+            blend_file_path: Path to .blend file
+        
+        Yields:
+            External file paths referenced in the blend file
+        """
+        if self._last_result is not None and self._last_result[0] == blend_file_path:
+            yield from self._last_result[1][1]
+            return
+        
+        result = yield from self._stream_all(self._ensure_worker, blend_file_path)
+        self._last_result = (blend_file_path, result)
+    
+    def extract_blend_metadata(
+        self,
+        blend_file_path: Path,
+        fields: Optional[Set[str]] = None,
+    ) -> BlendFileMetadata:
         """
         Extract metadata from a Blend file.
         
         Args:
             blend_file_path: Path to .blend file
+            fields: Names of the BlendFileMetadata counts that are needed, or
+                None for all of them. Leaving out 'total_vertex_count' skips
+                walking every mesh; it is then reported as 0.
         
         Returns:
             BlendFileMetadata object with counts and info
         """
-        script = """
-import bpy
-import json
-import sys
-
-blend_path = sys.argv[-1]
-
-try:
-    bpy.ops.wm.open_mainfile(filepath=blend_path)
-except Exception as e:
-    print(json.dumps({
-        "object_count": 0,
-        "scene_count": 0,
-        "material_count": 0,
-        "mesh_count": 0,
-        "total_vertex_count": 0,
-        "error": str(e)
-    }))
-    sys.exit(0)
-
-# Count objects
-object_count = len(bpy.data.objects)
-scene_count = len(bpy.data.scenes)
-material_count = len(bpy.data.materials)
-
-# Count meshes and vertices
-mesh_count = len(bpy.data.meshes)
-total_vertex_count = 0
-for mesh in bpy.data.meshes:
-    total_vertex_count += len(mesh.vertices)
-
-print(json.dumps({
-    "object_count": object_count,
-    "scene_count": scene_count,
-    "material_count": material_count,
-    "mesh_count": mesh_count,
-    "total_vertex_count": total_vertex_count,
-    "error": None
-}))
-"""
+        count_vertices = fields is None or 'total_vertex_count' in fields
         
-        try:
-            # Create temporary file for script
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-                f.write(script)
-                script_path = f.name
-            
-            # Run Blender
-            cmd = [
-                str(self.blender_exe),
-                '--background',
-                '--python', script_path,
-                '--', str(blend_file_path)
-            ]
-            
-            try:
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=120,
-                )
-                
-                # Parse output
-                output = result.stdout.strip()
-                lines = output.split('\n')
-                
-                # Find JSON line
-                for line in lines:
-                    if line.startswith('{'):
-                        data = json.loads(line)
-                        metadata = BlendFileMetadata(
-                            object_count=data.get('object_count', 0),
-                            scene_count=data.get('scene_count', 0),
-                            material_count=data.get('material_count', 0),
-                            mesh_count=data.get('mesh_count', 0),
-                            total_vertex_count=data.get('total_vertex_count', 0),
-                        )
-                        return metadata
-            
-            finally:
-                # Clean up temp file
-                Path(script_path).unlink(missing_ok=True)
+        # Uncompressed files without linked libraries can be read without Blender
+        metadata = self._fast_metadata(blend_file_path, count_vertices=count_vertices)
+        if metadata is not None:
+            return metadata
+        
+        if count_vertices:
+            return self.extract_blend_all(blend_file_path)[0]
+        
+        # Counts only - anything already known has at least these
+        if self._last_result is not None and self._last_result[0] == blend_file_path:
+            return self._last_result[1][0]
+        cached = self._cache.get(blend_file_path) if self._cache else None
+        if cached is not None:
+            return self._metadata_from_dict(cached[0])
         
+        try:
+            for frame in self._ensure_worker().stream('meta', blend_file_path, sorted(fields)):
+                if frame.get('error'):
+                    logger.warning("Blender script error: %s", frame['error'])
+                    break
+                if frame.get('done'):
+                    return self._metadata_from_dict(frame.get('meta') or {})
         except subprocess.TimeoutExpired:
-            print(f"Warning: Blender operation timed out for {blend_file_path}")
+            logger.warning("Blender operation timed out for %s", blend_file_path)
+        except json.JSONDecodeError as e:
+            logger.warning("Error parsing Blender output: %s", e)
         except Exception as e:
-            print(f"Warning: Error extracting Blender metadata from {blend_file_path}: {e}")
+            logger.warning("Error extracting Blender data from %s: %s", blend_file_path, e)
         
         return BlendFileMetadata()
     
-    def _run_blender_script(self, script: str, blend_file_path: Path) -> List[str]:
+    def extract_blend_all(self, blend_file_path: Path) -> Tuple[BlendFileMetadata, List[str]]:
+        """
+        Extract metadata and external file references from a Blend file.
+        
+        Both are gathered while the file is open in Blender once. The last
+        result is remembered, so calling extract_blend_metadata() and then
+        extract_blend_dependencies() for the same file only opens it once.
+        
+        Args:
+            blend_file_path: Path to .blend file
+        
+        Returns:
+            Tuple of (BlendFileMetadata, list of external file paths)
+        """
+        if self._last_result is not None and self._last_result[0] == blend_file_path:
+            return self._last_result[1]
+        
+        result = self._extract_all(self._ensure_worker, blend_file_path)
+        self._last_result = (blend_file_path, result)
+        return result
+    
+    def extract_many(
+        self,
+        blend_file_paths: List[Path],
+    ) -> Dict[Path, Tuple[BlendFileMetadata, List[str]]]:
         """
-        Run a Python script in Blender and return parsed JSON output.
+        Extract metadata and external file references from many Blend files in parallel.
+        
+        Runs up to one persistent Blender worker per CPU core, each limited to
+        its share of the cores so the workers don't oversubscribe the machine.
+        The workers stay running after the call and are reused by the next
+        one, until close().
         
         Args:
-            script: Python code to run in Blender
-            blend_file_path: Path to blend file to pass as argument
+            blend_file_paths: Paths to .blend files
         
         Returns:
-            List of external files
+            Dictionary mapping each path to its (BlendFileMetadata, external files) tuple
         """
-        try:
-            # Create temporary file for script
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-                f.write(script)
-                script_path = f.name
+        paths = list(dict.fromkeys(blend_file_paths))
+        if not paths:
+            return {}
+        
+        cpu_count = os.cpu_count() or 1
+        num_workers = min(len(paths), cpu_count)
+        threads = max(1, cpu_count // num_workers)
+        
+        pending: queue.Queue = queue.Queue()
+        for path in paths:
+            pending.put(path)
+        
+        results: Dict[Path, Tuple[BlendFileMetadata, List[str]]] = {}
+        
+        # The single-file worker joins the pool rather than sitting idle
+        if self._worker is not None:
+            self._pool.append(self._worker)
+            self._worker = None
+        
+        def drain() -> None:
+            worker = self._take_idle_worker()
             
-            # Run Blender
-            cmd = [
-                str(self.blender_exe),
-                '--background',
-                '--python', script_path,
-                '--', str(blend_file_path)
-            ]
+            def get_worker() -> _BlenderWorker:
+                nonlocal worker
+                if worker is None or not worker.alive:
+                    worker = _BlenderWorker(self._worker_command(threads), self.timeout)
+                return worker
             
             try:
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=120,
-                )
-                
-                # Parse output
-                output = result.stdout.strip()
-                lines = output.split('\n')
-                
-                # Find JSON line
-                for line in lines:
-                    if line.startswith('{'):
-                        data = json.loads(line)
-                        if data.get('error'):
-                            print(f"Warning: Blender script error: {data['error']}")
-                            return []
-                        return data.get('external_files', [])
-            
+                while True:
+                    try:
+                        path = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    results[path] = self._extract_all(get_worker, path)
             finally:
-                # Clean up temp file
-                Path(script_path).unlink(missing_ok=True)
+                if worker is not None:
+                    self._pool.append(worker)
+        
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            for future in [executor.submit(drain) for _ in range(num_workers)]:
+                future.result()
+        
+        return results
+    
+    def extract_many_batched(
+        self,
+        blend_file_paths: List[Path],
+    ) -> Dict[Path, Tuple[BlendFileMetadata, List[str]]]:
+        """
+        Extract metadata and external file references from many Blend files in fresh Blender runs.
+        
+        Unlike extract_many(), this starts new Blender processes for the call
+        (listing the files on their command lines, as many as fit on one)
+        and resets to factory settings before opening each file, so no state
+        can leak in from earlier files or from the persistent worker.
+        
+        Args:
+            blend_file_paths: Paths to .blend files
+        
+        Returns:
+            Dictionary mapping each path to its (BlendFileMetadata, external files) tuple
+        """
+        paths = list(dict.fromkeys(blend_file_paths))
+        results: Dict[Path, Tuple[BlendFileMetadata, List[str]]] = {}
+        
+        # Only files that really need Blender go on its command line - it
+        # answers for every file listed, in order
+        uncached = []
+        for path in paths:
+            cached = self._cached_result(path)
+            if cached is not None:
+                results[path] = cached
+                continue
+            metadata = self._fast_metadata(path, without_references=True)
+            if metadata is not None:
+                results[path] = (metadata, [])
+            else:
+                uncached.append(path)
+        
+        base_cmd = self._worker_command() + ['--']
+        for chunk in _command_line_chunks(base_cmd, uncached):
+            self._run_batch(base_cmd, chunk, results)
+        
+        return results
+    
+    def _run_batch(
+        self,
+        base_cmd: List[str],
+        paths: List[Path],
+        results: Dict[Path, Tuple[BlendFileMetadata, List[str]]],
+    ) -> None:
+        """
+        Extract Blend files in one fresh Blender run, listing them on its command line.
+        
+        Args:
+            base_cmd: Worker command line, up to and including '--'
+            paths: Paths to .blend files that need Blender
+            results: Dictionary the (BlendFileMetadata, external files) tuples are added to
+        """
+        # Files not answered yet, starting with the one being extracted
+        remaining = deque(paths)
+        batch: Optional[_BlenderBatch] = None
+        
+        def get_batch() -> _BlenderBatch:
+            nonlocal batch
+            if batch is None or not batch.alive:
+                # A batch that died (Blender crashed on a file) is replaced by
+                # one for the files it hadn't answered, instead of each of them
+                # waiting out the timeout on the dead process
+                if batch is not None:
+                    batch.close()
+                cmd = base_cmd + [str(path) for path in remaining]
+                batch = _BlenderBatch(cmd, self.timeout)
+            return batch
+        
+        try:
+            while remaining:
+                path = remaining[0]
+                results[path] = self._extract_all(get_batch, path, shortcuts=False)
+                remaining.popleft()
+        finally:
+            if batch is not None:
+                batch.close()
+    
+    def invalidate(self, blend_file_path: Path) -> None:
+        """Forget cached results for a blend file so it is re-read by Blender."""
+        if self._last_result is not None and self._last_result[0] == blend_file_path:
+            self._last_result = None
+        if self._cache:
+            self._cache.invalidate(blend_file_path)
+        # Its dependencies may have moved too
+        _normalize_dependency.cache_clear()
+    
+    def close(self) -> None:
+        """Shut down the persistent Blender workers, if any are running."""
+        if self._worker is not None:
+            self._worker.close()
+            self._worker = None
+        while self._pool:
+            self._pool.pop().close()
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+    
+    def _extract_all(
+        self,
+        get_worker: Callable[[], _BlenderWorker],
+        blend_file_path: Path,
+        shortcuts: bool = True,
+    ) -> Tuple[BlendFileMetadata, List[str]]:
+        """
+        Get metadata and external file references for one Blend file.
+        
+        Args:
+            get_worker: Returns a running worker, restarting it if needed
+            blend_file_path: Path to .blend file
+            shortcuts: See _stream_all()
+        
+        Returns:
+            Tuple of (BlendFileMetadata, external files) - empty if extraction failed
+        """
+        stream = self._stream_all(get_worker, blend_file_path, shortcuts)
+        try:
+            while True:
+                next(stream)
+        except StopIteration as finished:
+            return finished.value
+    
+    def _stream_all(
+        self,
+        get_worker: Callable[[], _BlenderWorker],
+        blend_file_path: Path,
+        shortcuts: bool = True,
+    ) -> Generator[str, None, Tuple[BlendFileMetadata, List[str]]]:
+        """
+        Stream external file references for one Blend file, then return everything.
+        
+        Args:
+            get_worker: Returns a running worker, restarting it if needed
+            blend_file_path: Path to .blend file
+            shortcuts: Answer from the cache or by reading the file directly
+                when possible. Batches pass False: they already did, and every
+                file on their command line has an answer that must be read.
+        
+        Yields:
+            External file paths as the worker reports them
+        
+        Returns:
+            Tuple of (BlendFileMetadata, sorted external files) - empty if extraction failed
+        """
+        if shortcuts:
+            cached = self._cached_result(blend_file_path)
+            if cached is not None:
+                yield from cached[1]
+                return cached
+            
+            # Every reference the worker reports comes from a library or an image
+            # datablock. Files with neither are read directly, without Blender.
+            metadata = self._fast_metadata(blend_file_path, without_references=True)
+            if metadata is not None:
+                return metadata, []
+        
+        references: List[Tuple[str, bool]] = []
+        external_files: List[str] = []
+        seen = set()
+        pending: Deque[Future] = deque()
+        
+        def checked(wait: bool) -> Iterator[str]:
+            # Hand out normalized paths in the order the worker reported them
+            while pending and (wait or pending[0].done()):
+                path = pending.popleft().result()
+                if path and path not in seen:
+                    seen.add(path)
+                    external_files.append(path)
+                    yield path
+        
+        try:
+            with closing(get_worker().stream('all', blend_file_path)) as frames:
+                for frame in frames:
+                    if 'dep' in frame:
+                        reference = (frame['dep'], frame.get('must_exist', False))
+                        references.append(reference)
+                        pending.append(_PATH_CHECK_POOL.submit(_normalize_dependency, *reference))
+                        yield from checked(wait=False)
+                        continue
+                    
+                    if frame.get('error'):
+                        logger.warning("Blender script error: %s", frame['error'])
+                        return BlendFileMetadata(), []
+                    
+                    yield from checked(wait=True)
+                    meta = frame.get('meta') or {}
+                    external_files.sort()
+                    if self._cache:
+                        self._cache.put(blend_file_path, meta, references)
+                    return self._metadata_from_dict(meta), external_files
         
         except subprocess.TimeoutExpired:
-            print(f"Warning: Blender operation timed out for {blend_file_path}")
+            logger.warning("Blender operation timed out for %s", blend_file_path)
         except json.JSONDecodeError as e:
-            print(f"Warning: Error parsing Blender output: {e}")
+            logger.warning("Error parsing Blender output: %s", e)
         except Exception as e:
-            print(f"Warning: Error running Blender script: {e}")
+            logger.warning("Error extracting Blender data from %s: %s", blend_file_path, e)
+        
+        return BlendFileMetadata(), []
+    
+    def _cached_result(
+        self,
+        blend_file_path: Path,
+    ) -> Optional[Tuple[BlendFileMetadata, List[str]]]:
+        """
+        Look up a Blend file's results in the on-disk cache.
+        
+        The cache holds the references as Blender reported them. They are
+        normalized here on every hit, so an image texture that was missing
+        when the file was read is linked as soon as it exists.
+        
+        Args:
+            blend_file_path: Path to .blend file
+        
+        Returns:
+            Tuple of (BlendFileMetadata, sorted external files), or None if not cached
+        """
+        cached = self._cache.get(blend_file_path) if self._cache else None
+        if cached is None:
+            return None
+        
+        meta, references = cached
+        paths = _PATH_CHECK_POOL.map(
+            _normalize_dependency,
+            [path for path, _ in references],
+            [must_exist for _, must_exist in references],
+        )
+        return self._metadata_from_dict(meta), sorted({path for path in paths if path})
+    
+    @staticmethod
+    def _fast_metadata(
+        blend_file_path: Path,
+        count_vertices: bool = True,
+        without_references: bool = False,
+    ) -> Optional[BlendFileMetadata]:
+        """
+        Read metadata counts straight from a .blend file, without Blender.
+        
+        Walks the file's block headers and counts datablocks by code. Mesh
+        vertex totals are read from each Mesh block using the struct layout
+        described by the file's own SDNA.
+        
+        Args:
+            blend_file_path: Path to .blend file
+            count_vertices: Read mesh vertex totals (otherwise reported as 0)
+            without_references: Also give up (return None) if the file has
+                image datablocks, so a result means the file references no
+                external files at all
+        
+        Returns:
+            BlendFileMetadata, or None if the file is compressed, links data
+            from other files (the counts would then depend on the libraries)
+            or doesn't have a layout we understand
+        """
+        counts = dict.fromkeys(_BLOCK_COUNTERS.values(), 0)
+        mesh_blocks: List[Tuple[int, int]] = []  # (data offset, SDNA struct index)
+        dna = None
+        
+        try:
+            with open(blend_file_path, 'rb') as f:
+                header = f.read(17)
+                if header.startswith(_COMPRESSED_MAGIC) or not header.startswith(b'BLENDER'):
+                    return None
+                
+                if header[7:9].isdigit():
+                    # Blender 5.0+ header, e.g. BLENDER17-01v0500, with 64-bit block lengths
+                    if header[7:12] != b'17-01':
+                        return None
+                    pointer_size, endian, header_size = 8, header[12:13], 17
+                    large_bhead = True
+                else:
+                    # Classic header, e.g. BLENDER-v405
+                    classic_size = {b'_': 4, b'-': 8}.get(header[7:8])
+                    if classic_size is None:
+                        return None
+                    pointer_size, endian, header_size = classic_size, header[8:9], 12
+                    large_bhead = False
+                if endian not in (b'v', b'V'):
+                    return None
+                
+                order = '<' if endian == b'v' else '>'
+                if large_bhead:
+                    bhead = struct.Struct(order + '4siQqq')  # code, SDNAnr, old, len, nr
+                elif pointer_size == 8:
+                    bhead = struct.Struct(order + '4siQii')  # code, len, old, SDNAnr, nr
+                else:
+                    bhead = struct.Struct(order + '4siIii')
+                
+                f.seek(header_size)
+                while True:
+                    raw = f.read(bhead.size)
+                    if len(raw) < bhead.size:
+                        return None
+                    if large_bhead:
+                        code, sdna_index, _, length, _ = bhead.unpack(raw)
+                    else:
+                        code, length, _, sdna_index, _ = bhead.unpack(raw)
+                    
+                    if code == b'ENDB':
+                        break
+                    if code == b'LI\0\0' or (without_references and code == b'IM\0\0'):
+                        return None
+                    if code == b'DNA1':
+                        dna = f.read(length)
+                        continue
+                    
+                    counter = _BLOCK_COUNTERS.get(code)
+                    if counter:
+                        counts[counter] += 1
+                        if code == b'ME\0\0':
+                            mesh_blocks.append((f.tell(), sdna_index))
+                    f.seek(length, os.SEEK_CUR)
+                
+                if dna is None:
+                    return None
+                
+                total_vertex_count = 0
+                if count_vertices and mesh_blocks:
+                    sdna = _parse_sdna(dna, order)
+                    if sdna is None:
+                        return None
+                    
+                    vertex_field_offsets: Dict[int, Optional[int]] = {}
+                    for data_offset, sdna_index in mesh_blocks:
+                        if sdna_index not in vertex_field_offsets:
+                            vertex_field_offsets[sdna_index] = _sdna_field_offset(
+                                sdna, sdna_index, ('totvert', 'verts_num'), pointer_size
+                            )
+                        field_offset = vertex_field_offsets[sdna_index]
+                        if field_offset is None:
+                            return None
+                        f.seek(data_offset + field_offset)
+                        (vertex_count,) = struct.unpack(order + 'i', f.read(4))
+                        total_vertex_count += vertex_count
+        
+        except (OSError, struct.error):
+            return None
+        
+        return BlendFileMetadata(
+            object_count=counts['object_count'],
+            scene_count=counts['scene_count'],
+            material_count=counts['material_count'],
+            mesh_count=counts['mesh_count'],
+            total_vertex_count=total_vertex_count,
+        )
+    
+    @staticmethod
+    def _metadata_from_dict(meta: Dict[str, Any]) -> BlendFileMetadata:
+        """Build a BlendFileMetadata from the counts reported by the worker."""
+        return BlendFileMetadata(
+            object_count=meta.get('object_count', 0),
+            scene_count=meta.get('scene_count', 0),
+            material_count=meta.get('material_count', 0),
+            mesh_count=meta.get('mesh_count', 0),
+            total_vertex_count=meta.get('total_vertex_count', 0),
+        )
+    
+    def _ensure_worker(self) -> _BlenderWorker:
+        """
+        Start the persistent Blender worker if it is not already running.
+        
+        Returns:
+            The running worker
+        """
+        if self._worker is None or not self._worker.alive:
+            self._worker = (
+                self._take_idle_worker()
+                or _BlenderWorker(self._worker_command(), self.timeout)
+            )
+        return self._worker
+    
+    def _take_idle_worker(self) -> Optional[_BlenderWorker]:
+        """
+        Take a running worker out of the pool left by extract_many().
+        
+        Returns:
+            The worker, or None if the pool has no running worker
+        """
+        while True:
+            try:
+                worker = self._pool.pop()  # atomic, so safe across drain threads
+            except IndexError:
+                return None
+            if worker.alive:
+                return worker
+            worker.close()
+    
+    def _worker_command(self, threads: Optional[int] = None) -> List[str]:
+        """
+        Build the command line that starts a worker process.
+        
+        Args:
+            threads: Number of threads Blender may use (None for Blender's default)
         
-        return []
+        Returns:
+            Command line as a list of arguments
+        """
+        cmd = [str(self.blender_exe), '--background']
+        if threads:
+            cmd += ['--threads', str(threads)]
+        # The script is passed inline - no temp file to write and clean up
+        cmd += ['--python-expr', _WORKER_SCRIPT]
+        return cmd
@@ -1,8 +1,16 @@
 """Command-line interface for Blender documentation tool."""
 
 import argparse
-from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _path(value: str) -> 'Path':
+    """argparse type for paths; pathlib is only imported once a path is parsed."""
+    from pathlib import Path
+    return Path(value)
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -16,15 +24,15 @@ def create_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         '--folder',
         required=True,
-        type=Path,
+        type=_path,
         help='Root folder of the Blender project to scan',
     )
     
     # Optional arguments
     parser.add_argument(
         '-o', '--output',
-        type=Path,
-        default=Path.cwd() / 'blender_doc_report.pdf',
+        type=_path,
+        default=argparse.SUPPRESS,
         help='Output PDF path (default: ./blender_doc_report.pdf)',
     )
     
@@ -48,11 +56,17 @@ def create_parser() -> argparse.ArgumentParser:
         help='Follow external links outside the project folder',
     )
     
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Re-read every blend file and redraw the graph instead of reusing cached results',
+    )
+    
     # Blender path
     parser.add_argument(
         '--blender-path',
-        type=Path,
-        default=None,
+        type=_path,
+        default=argparse.SUPPRESS,
         help='Path to Blender executable (auto-detected if not specified)',
     )
     
@@ -83,6 +97,12 @@ def validate_args(args: argparse.Namespace) -> None:
     if not args.folder.is_dir():
         raise ValueError(f"Path is not a directory: {args.folder}")
     
+    # Optional paths are left off the namespace unless given (argparse.SUPPRESS),
+    # so their defaults are only computed here, after a successful parse
+    if getattr(args, 'output', None) is None:
+        args.output = _path('blender_doc_report.pdf').absolute()
+    args.blender_path = getattr(args, 'blender_path', None)
+    
     # Validate output directory exists (or can be created)
     output_dir = args.output.parent
     if not output_dir.exists():
@@ -114,6 +134,13 @@ def main() -> int:
         parser.error(str(e))
         return 1
     
+    # Progress and warnings from the processing modules go through logging
+    import logging
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(levelname)s: %(message)s',
+    )
+    
     # Import main processing function
     from .main import process_project
     
@@ -126,7 +153,7 @@ def main() -> int:
             output_mode=output_mode,
             follow_external=args.follow_external,
             blender_path=args.blender_path,
-            verbose=args.verbose,
+            use_cache=not args.no_cache,
         )
         
         return 0
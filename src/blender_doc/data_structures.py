@@ -1,12 +1,22 @@
 """Data structures for Blender project documentation."""
 
 from dataclasses import dataclass, field
-from typing import Optional, Dict, Any, List
+from types import MappingProxyType
+from typing import (
+    AbstractSet, Optional, Callable, Dict, Any, List, Mapping, Set, Tuple, Union,
+)
 from pathlib import Path
 import os
 
+import numpy as np
 
-@dataclass
+
+# FileEntry.flags bits
+FLAG_LEAF = 1  # no external links to track (images, audio, text, ...)
+FLAG_BLEND = 2  # Blender file
+
+
+@dataclass(slots=True)
 class FileEntry:
     """Represents a file in the Blender project with metadata and links."""
     
@@ -21,25 +31,45 @@ class FileEntry:
     
     # Links to other files (dependencies)
     links: List['FileEntry'] = field(default_factory=list)
+    # id() of every entry in links, for constant-time duplicate checks. Only
+    # allocated once there is a link - most files (textures, audio...) have none.
+    _link_ids: Optional[Set[int]] = field(default=None, init=False, repr=False, compare=False)
     
     # Whether this file has been processed
     processed: bool = False
     
+    # Classification bits (FLAG_LEAF, FLAG_BLEND), set by the scanner when the
+    # entry is created so processing loops test a bit instead of the type
+    flags: int = 0
+    
+    # String forms of path and folder, computed once (used as dict keys everywhere)
+    path_str: str = field(init=False, repr=False, compare=False)
+    folder_str: str = field(init=False, repr=False, compare=False)
+    
     def __post_init__(self):
         """Set full path after initialization."""
         self.path = self.folder / self.name
+        self.path_str = os.fspath(self.path)
+        self.folder_str = os.fspath(self.folder)
+        if self.links:
+            self._link_ids = {id(link) for link in self.links}
     
     def add_link(self, target_file: 'FileEntry') -> None:
         """Add a dependency link to another file."""
-        if target_file not in self.links:
-            self.links.append(target_file)
+        # Entries are unique per path (see MetadataStore), so identity is enough
+        if self._link_ids is None:
+            self._link_ids = set()
+        elif id(target_file) in self._link_ids:
+            return
+        self._link_ids.add(id(target_file))
+        self.links.append(target_file)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
         return {
             'name': self.name,
-            'folder': str(self.folder),
-            'path': str(self.path),
+            'folder': self.folder_str,
+            'path': self.path_str,
             'size': self.size,
             'file_type': self.file_type,
             'metadata': self.metadata,
@@ -49,7 +79,7 @@ class FileEntry:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class BlendFileMetadata:
     """Metadata specific to Blender files."""
     
@@ -79,27 +109,33 @@ class MetadataStore:
         self._entries: Dict[str, FileEntry] = {}  # path -> FileEntry
         self._by_type: Dict[str, List[FileEntry]] = {}  # type -> entries
         self._by_folder: Dict[str, List[FileEntry]] = {}  # folder -> entries
+        self._interned: Dict[str, str] = {}  # file type / folder string -> shared copy
         self._root_folder: Optional[Path] = None
+        self._root_prefix = ''  # root folder with a trailing separator
     
     def add_entry(self, entry: FileEntry) -> None:
         """Add a file entry to the store."""
-        entry_key = str(entry.path)
+        entry_key = entry.path_str
         self._entries[entry_key] = entry
         
+        # Share one string object per distinct type/folder, so the many entries
+        # with the same value don't each keep a copy and key lookups hit on identity
+        entry.file_type = type_key = self._interned.setdefault(entry.file_type, entry.file_type)
+        entry.folder_str = folder_key = self._interned.setdefault(entry.folder_str, entry.folder_str)
+        
         # Index by type
-        if entry.file_type not in self._by_type:
-            self._by_type[entry.file_type] = []
-        self._by_type[entry.file_type].append(entry)
+        if type_key not in self._by_type:
+            self._by_type[type_key] = []
+        self._by_type[type_key].append(entry)
         
         # Index by folder
-        folder_key = str(entry.folder)
         if folder_key not in self._by_folder:
             self._by_folder[folder_key] = []
         self._by_folder[folder_key].append(entry)
     
-    def get_entry(self, path: Path) -> Optional[FileEntry]:
+    def get_entry(self, path: Union[Path, str]) -> Optional[FileEntry]:
         """Retrieve an entry by path."""
-        return self._entries.get(str(path))
+        return self._entries.get(os.fspath(path))
     
     def get_by_type(self, file_type: str) -> List[FileEntry]:
         """Get all entries of a specific type."""
@@ -116,6 +152,7 @@ class MetadataStore:
     def set_root_folder(self, folder: Path) -> None:
         """Set the root folder for relative path calculations."""
         self._root_folder = folder
+        self._root_prefix = os.path.join(os.fspath(folder), '') if folder else ''
     
     def get_root_folder(self) -> Optional[Path]:
         """Get the root folder."""
@@ -123,12 +160,9 @@ class MetadataStore:
     
     def get_relative_path(self, entry: FileEntry) -> str:
         """Get relative path from root folder."""
-        if not self._root_folder:
-            return str(entry.path)
-        try:
-            return str(entry.path.relative_to(self._root_folder))
-        except ValueError:
-            return str(entry.path)
+        if self._root_prefix and entry.path_str.startswith(self._root_prefix):
+            return entry.path_str[len(self._root_prefix):]
+        return entry.path_str
     
     def stats(self) -> Dict[str, Any]:
         """Get statistics about the metadata store."""
@@ -145,16 +179,44 @@ class LinkRegistry:
     """Manages file interdependencies and prevents cyclic link issues."""
     
     def __init__(self):
-        self._links: Dict[str, set] = {}  # source -> set of target paths
-        self._reverse_links: Dict[str, set] = {}  # target -> set of source paths
-        self._visited: set = set()  # for cycle detection
+        self._links: Dict[str, Set[str]] = {}  # source -> set of target paths
+        self._reverse_links: Dict[str, Set[str]] = {}  # target -> set of source paths
+        # What the getters read: the dicts above until seal() replaces them
+        # with read-only tables
+        self._link_view: Mapping[str, AbstractSet[str]] = self._links
+        self._reverse_link_view: Mapping[str, AbstractSet[str]] = self._reverse_links
+        
+        # Topological order of all linked paths (Pearce-Kelly), kept up to
+        # date as links are added so cycle checks only look at the part of
+        # the graph between the two endpoints
+        self._ord: Dict[str, int] = {}
+        
+        # Links already rejected as cycles. Links are never removed, so once
+        # target reaches source it always will and these never go stale.
+        self._cyclic: Set[Tuple[str, str]] = set()
+        
+        self._sealed = False
     
     def add_link(self, source_path: str, target_path: str) -> bool:
         """
         Add a link between two files.
         Returns False if this would create a cycle, True otherwise.
         """
-        if self._would_create_cycle(source_path, target_path):
+        if self._sealed:
+            raise RuntimeError("Cannot add links to a sealed LinkRegistry")
+        if source_path == target_path:
+            return False
+        if target_path in self._links.get(source_path, ()):
+            return True
+        if (source_path, target_path) in self._cyclic:
+            return False
+        
+        for path in (source_path, target_path):
+            if path not in self._ord:
+                self._ord[path] = len(self._ord)
+        
+        if not self._reorder(source_path, target_path):
+            self._cyclic.add((source_path, target_path))
             return False
         
         if source_path not in self._links:
@@ -167,37 +229,119 @@ class LinkRegistry:
         
         return True
     
-    def _would_create_cycle(self, source: str, target: str) -> bool:
-        """Check if adding a link would create a cycle."""
-        self._visited.clear()
-        return self._has_path_to(target, source)
-    
-    def _has_path_to(self, start: str, goal: str) -> bool:
-        """DFS to check if there's a path from start to goal."""
-        if start == goal:
-            return True
-        if start in self._visited:
+    def _reorder(self, source: str, target: str) -> bool:
+        """
+        Update the topological order for a new source -> target link.
+        
+        Returns False (leaving the order untouched) if the link would create a cycle.
+        """
+        order = self._ord
+        lower, upper = order[target], order[source]
+        if lower > upper:
+            return True  # already in order
+        
+        # Everything reachable from target that currently sorts before source
+        forward = self._collect(target, self._links, lambda n: order[n] <= upper)
+        if source in forward:
             return False
-        self._visited.add(start)
         
-        for next_node in self._links.get(start, set()):
-            if self._has_path_to(next_node, goal):
-                return True
+        # Everything that reaches source and currently sorts after target
+        backward = self._collect(source, self._reverse_links, lambda n: order[n] > lower)
         
-        return False
+        # Move the backward set in front of the forward set, reusing their slots
+        nodes = sorted(backward, key=order.__getitem__) + sorted(forward, key=order.__getitem__)
+        slots = sorted(order[n] for n in nodes)
+        for node, slot in zip(nodes, slots):
+            order[node] = slot
+        return True
+    
+    @staticmethod
+    def _collect(start: str, edges: Dict[str, set], within: Callable[[str], bool]) -> set:
+        """Iterative DFS from start over edges, only entering nodes accepted by within."""
+        found = {start}
+        stack = [start]
+        while stack:
+            for next_node in edges.get(stack.pop(), ()):
+                if next_node not in found and within(next_node):
+                    found.add(next_node)
+                    stack.append(next_node)
+        return found
     
-    def get_links(self, source_path: str) -> set:
+    def seal(self) -> None:
+        """
+        Freeze the registry once all links are known.
+        
+        The dict-of-sets storage is compacted into read-only CSR tables (see
+        _LinkTable) and the bookkeeping only needed for cycle checks is dropped;
+        add_link raises afterwards.
+        """
+        if self._sealed:
+            return
+        
+        paths = list(self._ord)
+        ids = {path: index for index, path in enumerate(paths)}
+        self._link_view = _LinkTable(paths, ids, self._links)
+        self._reverse_link_view = _LinkTable(paths, ids, self._reverse_links)
+        self._links = {}
+        self._reverse_links = {}
+        self._ord = {}
+        self._cyclic = set()
+        self._sealed = True
+    
+    def get_links(self, source_path: str) -> AbstractSet[str]:
         """Get all outgoing links from a source file."""
-        return self._links.get(source_path, set())
+        return self._link_view.get(source_path, frozenset() if self._sealed else set())
     
-    def get_reverse_links(self, target_path: str) -> set:
+    def get_reverse_links(self, target_path: str) -> AbstractSet[str]:
         """Get all incoming links to a target file."""
-        return self._reverse_links.get(target_path, set())
+        return self._reverse_link_view.get(target_path, frozenset() if self._sealed else set())
+    
+    def get_all_links(self) -> Mapping[str, AbstractSet[str]]:
+        """Get all links (read-only view)."""
+        return MappingProxyType(self._link_view)
+    
+    def get_all_reverse_links(self) -> Mapping[str, AbstractSet[str]]:
+        """Get all reverse links (read-only view)."""
+        return MappingProxyType(self._reverse_link_view)
+
+
+class _LinkTable(Mapping):
+    """
+    Read-only path -> frozenset of paths mapping stored as CSR arrays.
+    
+    The targets of the path with id i are paths[indices[indptr[i]:indptr[i + 1]]];
+    ids are shared between the forward and reverse tables of a registry.
+    """
+    
+    __slots__ = ('_paths', '_ids', '_indptr', '_indices', '_keys')
+    
+    def __init__(self, paths: List[str], ids: Dict[str, int], links: Dict[str, set]):
+        counts = np.zeros(len(paths), dtype=np.int32)
+        for path, targets in links.items():
+            counts[ids[path]] = len(targets)
+        
+        self._paths = paths
+        self._ids = ids
+        self._indptr = np.zeros(len(paths) + 1, dtype=np.int32)
+        np.cumsum(counts, out=self._indptr[1:])
+        self._indices = np.empty(int(self._indptr[-1]), dtype=np.int32)
+        for path, targets in links.items():
+            start = self._indptr[ids[path]]
+            self._indices[start:start + len(targets)] = [ids[target] for target in targets]
+        
+        # Same keys, in the same order, as the dict this replaces
+        self._keys = [path for path, targets in links.items() if targets]
+    
+    def __getitem__(self, path: str) -> frozenset:
+        index = self._ids.get(path)
+        if index is None or self._indptr[index] == self._indptr[index + 1]:
+            raise KeyError(path)
+        paths = self._paths
+        targets = self._indices[self._indptr[index]:self._indptr[index + 1]]
+        return frozenset(paths[target] for target in targets.tolist())
     
-    def get_all_links(self) -> Dict[str, set]:
-        """Get all links."""
-        return self._links.copy()
+    def __iter__(self):
+        return iter(self._keys)
     
-    def get_all_reverse_links(self) -> Dict[str, set]:
-        """Get all reverse links."""
-        return self._reverse_links.copy()
+    def __len__(self) -> int:
+        return len(self._keys)
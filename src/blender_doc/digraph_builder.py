@@ -1,14 +1,22 @@
 """Digraph builder for file dependencies grouped by folder hierarchy."""
 
+import os
+from array import array
+from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
-import networkx as nx
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
 
 from .data_structures import FileEntry, MetadataStore, LinkRegistry
 
+# networkx is slow to import, so it is only imported where a graph is used
+if TYPE_CHECKING:
+    import networkx as nx
+
 
 class DigraphBuilder:
-    """Builds a networkx digraph representing file dependencies."""
+    """Builds a digraph representing file dependencies."""
     
     def __init__(self, metadata_store: MetadataStore, link_registry: LinkRegistry):
         """
@@ -20,9 +28,25 @@ class DigraphBuilder:
         """
         self.metadata_store = metadata_store
         self.link_registry = link_registry
-        self.digraph: nx.DiGraph = nx.DiGraph()
+        self._reset()
     
-    def build_by_folder_hierarchy(self, root_folder: Path) -> nx.DiGraph:
+    def _reset(self) -> None:
+        """Start over with an empty graph."""
+        # Nodes, in insertion order, with their attributes
+        self.node_ids: List[str] = []
+        self.node_attrs: List[Dict[str, Any]] = []
+        
+        # Edges in compressed sparse row form: the targets of node i are
+        # indices[indptr[i]:indptr[i + 1]], with matching weights
+        self.indptr = np.zeros(1, dtype=np.int32)
+        self.indices = np.zeros(0, dtype=np.int32)
+        self.weights = np.zeros(0, dtype=np.int32)
+        
+        # networkx view and statistics, only computed when someone asks for them
+        self._digraph: Optional['nx.DiGraph'] = None
+        self._statistics: Optional[Dict[str, Any]] = None
+    
+    def build_by_folder_hierarchy(self, root_folder: Path) -> None:
         """
         Build a digraph with files as nodes, grouped by folder.
         
@@ -31,90 +55,185 @@ class DigraphBuilder:
         
         Args:
             root_folder: Root folder for the project
-        
-        Returns:
-            networkx DiGraph
         """
-        self.digraph = nx.DiGraph()
-        root_folder = Path(root_folder)
+        self._reset()
+        root_str = os.fspath(root_folder)
+        root_prefix = os.path.join(root_str, '')
+        entries = self.metadata_store.get_all_entries()
+        node_index: Dict[str, int] = {}
+        
+        # Node ids and folder groups, memoized by path/folder string for this build
+        file_node_ids: Dict[str, str] = {}
+        folder_groups: Dict[str, str] = {}
+        
+        def file_node_id(entry: FileEntry) -> str:
+            node_id = file_node_ids.get(entry.path_str)
+            if node_id is None:
+                node_id = file_node_ids[entry.path_str] = self._get_file_node_id(entry, root_prefix)
+            return node_id
         
         # Create node for each file
-        for entry in self.metadata_store.get_all_entries():
-            node_id = self._get_file_node_id(entry, root_folder)
-            folder_group = self._get_folder_group(entry, root_folder)
+        for entry in entries:
+            node_id = file_node_id(entry)
+            folder_group = folder_groups.get(entry.folder_str)
+            if folder_group is None:
+                folder_group = folder_groups[entry.folder_str] = self._get_folder_group(
+                    entry, root_prefix
+                )
             
-            self.digraph.add_node(
-                node_id,
-                file_name=entry.name,
-                file_path=str(entry.path),
-                folder=str(entry.folder),
-                folder_group=folder_group,
-                size=entry.size,
-                file_type=entry.file_type,
-                label=entry.name,
-            )
+            attrs = {
+                'file_name': entry.name,
+                'file_path': entry.path_str,
+                'folder': entry.folder_str,
+                'folder_group': folder_group,
+                'size': entry.size,
+                'file_type': entry.file_type,
+                'label': entry.name,
+            }
+            
+            index = node_index.get(node_id)
+            if index is None:
+                node_index[node_id] = len(self.node_ids)
+                self.node_ids.append(node_id)
+                self.node_attrs.append(attrs)
+            else:
+                self.node_attrs[index] = attrs
         
-        # Create edges based on links between files
-        for entry in self.metadata_store.get_all_entries():
-            source_node_id = self._get_file_node_id(entry, root_folder)
+        # Collect one (source, target) pair per link between files
+        sources = array('l')
+        targets = array('l')
+        for entry in entries:
+            if not entry.links:
+                continue  # most files (textures, audio, ...) link to nothing
+            source = node_index[file_node_id(entry)]
             
-            # Check links from this file
             for linked_entry in entry.links:
-                target_node_id = self._get_file_node_id(linked_entry, root_folder)
+                target_node_id = file_node_id(linked_entry)
+                target = node_index.get(target_node_id)
+                if target is None:
+                    # Linked file that isn't in the store - node without attributes
+                    target = node_index[target_node_id] = len(self.node_ids)
+                    self.node_ids.append(target_node_id)
+                    self.node_attrs.append({})
                 
-                # Add edge
-                if not self.digraph.has_edge(source_node_id, target_node_id):
-                    self.digraph.add_edge(
-                        source_node_id,
-                        target_node_id,
-                        weight=1,
-                    )
-                else:
-                    # Increment weight if edge already exists
-                    self.digraph[source_node_id][target_node_id]['weight'] += 1
-        
-        return self.digraph
+                sources.append(source)
+                targets.append(target)
+        
+        # Repeated pairs become one edge whose weight is the number of links
+        node_count = len(self.node_ids)
+        if sources:
+            keys = np.asarray(sources, dtype=np.int64) * node_count
+            keys += np.asarray(targets, dtype=np.int64)
+            edges, counts = np.unique(keys, return_counts=True)
+            edge_sources = edges // node_count
+            self.indices = (edges % node_count).astype(np.int32)
+            self.weights = counts.astype(np.int32)
+        else:
+            edge_sources = np.zeros(0, dtype=np.int64)
+        
+        self.indptr = np.zeros(node_count + 1, dtype=np.int32)
+        np.cumsum(np.bincount(edge_sources, minlength=node_count), out=self.indptr[1:])
     
-    def _get_file_node_id(self, entry: FileEntry, root_folder: Path) -> str:
+    @staticmethod
+    def _get_file_node_id(entry: FileEntry, root_prefix: str) -> str:
         """Get a unique node ID for a file."""
-        try:
-            rel_path = entry.path.relative_to(root_folder)
-            return str(rel_path).replace('\\', '/')
-        except ValueError:
-            return str(entry.path)
+        if entry.path_str.startswith(root_prefix):
+            return entry.path_str[len(root_prefix):].replace('\\', '/')
+        return entry.path_str
     
-    def _get_folder_group(self, entry: FileEntry, root_folder: Path) -> str:
+    @staticmethod
+    def _get_folder_group(entry: FileEntry, root_prefix: str) -> str:
         """Get the folder group for visualization purposes."""
-        try:
-            rel_path = entry.folder.relative_to(root_folder)
-            folder_str = str(rel_path).replace('\\', '/')
-            return folder_str if folder_str != '.' else 'root'
-        except ValueError:
-            return entry.folder.name
+        folder_str = os.path.join(entry.folder_str, '')
+        if folder_str == root_prefix:
+            return 'root'
+        if folder_str.startswith(root_prefix):
+            return entry.folder_str[len(root_prefix):].replace('\\', '/')
+        return entry.folder.name
     
-    def get_digraph(self) -> nx.DiGraph:
-        """Get the built digraph."""
-        return self.digraph
+    @property
+    def digraph(self) -> 'nx.DiGraph':
+        """The built graph as a networkx DiGraph."""
+        return self.get_digraph()
+    
+    def get_digraph(self) -> 'nx.DiGraph':
+        """Get the built digraph as a networkx DiGraph (created on first use)."""
+        if self._digraph is None:
+            import networkx as nx
+            
+            digraph = nx.DiGraph()
+            digraph.add_nodes_from(zip(self.node_ids, self.node_attrs))
+            
+            node_ids = self.node_ids
+            edge_sources = np.repeat(np.arange(len(node_ids)), np.diff(self.indptr))
+            digraph.add_edges_from(
+                (node_ids[source], node_ids[target], {'weight': weight})
+                for source, target, weight in zip(
+                    edge_sources.tolist(), self.indices.tolist(), self.weights.tolist()
+                )
+            )
+            self._digraph = digraph
+        
+        return self._digraph
     
     def get_statistics(self) -> Dict:
-        """Get statistics about the digraph."""
-        return {
-            'file_count': self.digraph.number_of_nodes(),
-            'link_count': self.digraph.number_of_edges(),
-            'density': nx.density(self.digraph) if self.digraph.number_of_nodes() > 0 else 0,
-            'is_dag': nx.is_directed_acyclic_graph(self.digraph),
-            'connected_components': nx.number_weakly_connected_components(self.digraph) if self.digraph.number_of_nodes() > 0 else 0,
-        }
+        """Get statistics about the digraph (computed once per build)."""
+        if self._statistics is None:
+            node_count = len(self.node_ids)
+            link_count = len(self.indices)
+            
+            self._statistics = {
+                'file_count': node_count,
+                'link_count': link_count,
+                'density': link_count / (node_count * (node_count - 1)) if node_count > 1 else 0,
+                'is_dag': self._is_dag(),
+                'connected_components': self._count_weak_components(),
+            }
+        
+        return dict(self._statistics)
+    
+    def _is_dag(self) -> bool:
+        """Check for cycles by repeatedly removing nodes without incoming edges (Kahn)."""
+        indptr = self.indptr.tolist()
+        indices = self.indices.tolist()
+        in_degree = np.bincount(self.indices, minlength=len(self.node_ids)).tolist()
+        
+        ready = [node for node, degree in enumerate(in_degree) if degree == 0]
+        removed = 0
+        while ready:
+            node = ready.pop()
+            removed += 1
+            for target in indices[indptr[node]:indptr[node + 1]]:
+                in_degree[target] -= 1
+                if in_degree[target] == 0:
+                    ready.append(target)
+        
+        return removed == len(self.node_ids)
+    
+    def _count_weak_components(self) -> int:
+        """Count connected components, ignoring edge direction (union-find over the edges)."""
+        parent = list(range(len(self.node_ids)))
+        
+        def find(node: int) -> int:
+            while parent[node] != node:
+                parent[node] = node = parent[parent[node]]  # path halving
+            return node
+        
+        components = len(parent)
+        edge_sources = np.repeat(np.arange(len(parent)), np.diff(self.indptr))
+        for source, target in zip(edge_sources.tolist(), self.indices.tolist()):
+            source_root, target_root = find(source), find(target)
+            if source_root != target_root:
+                parent[source_root] = target_root
+                components -= 1
+        
+        return components
     
     def get_folder_groups(self) -> Dict[str, List[str]]:
         """Get files grouped by folder."""
-        groups: Dict[str, List[str]] = {}
+        groups: Dict[str, List[str]] = defaultdict(list)
         
-        for node in self.digraph.nodes():
-            folder_group = self.digraph.nodes[node].get('folder_group', 'root')
-            if folder_group not in groups:
-                groups[folder_group] = []
-            groups[folder_group].append(node)
+        for node_id, attrs in zip(self.node_ids, self.node_attrs):
+            groups[attrs.get('folder_group', 'root')].append(node_id)
         
-        return groups
-
+        return dict(groups)
@@ -1,15 +1,46 @@
 """File processing orchestration - processes stack of files."""
 
 from collections import deque
+from concurrent.futures import (
+    Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed,
+)
 from pathlib import Path
-from typing import Optional, List, Set
-import sys
+from typing import Callable, Iterable, Optional, Dict, List, Set, Tuple
+import logging
+import multiprocessing
+import os
+import stat
 
-from .data_structures import FileEntry, MetadataStore, LinkRegistry, BlendFileMetadata
+from .data_structures import (
+    FLAG_BLEND, FLAG_LEAF, FileEntry, MetadataStore, LinkRegistry, BlendFileMetadata,
+)
 from .file_scanner import FileScanner
 from .metadata_extractor import MetadataExtractor
 from .blender_integration import BlenderIntegration
 
+logger = logging.getLogger(__name__)
+
+# File types whose metadata extraction is CPU bound (decoding/parsing), worth
+# handing to worker processes, and how many of them go to a process at a time
+CPU_BOUND_TYPES = frozenset({
+    'jpg', 'jpeg', 'png', 'tiff', 'tif', 'bmp', 'gif', 'webp', 'exr', 'hdr', 'obj',
+})
+PROCESS_CHUNK_SIZE = 50
+
+# The process pool starts while the scanner and metadata thread pools are
+# running. Forking a process with live threads can deadlock the child on a
+# lock held at fork time, so worker processes are started fresh instead.
+_PROCESS_CONTEXT = multiprocessing.get_context(
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+)
+# Windows can't wait on more worker processes than this
+_MAX_PROCESSES = 61
+
+
+def _extract_batch(files: List[Tuple[Path, str]]) -> List[Dict]:
+    """Extract metadata for (path, file type) pairs (runs in a worker thread or process)."""
+    return [MetadataExtractor.extract(path, file_type) for path, file_type in files]
+
 
 class FileProcessor:
     """Orchestrates the processing of files in the stack."""
@@ -33,6 +64,8 @@ class FileProcessor:
             follow_external: Whether to follow external links outside root folder
         """
         self.root_folder = Path(root_folder)
+        # Root folder with a trailing separator, for cheap "is it inside" prefix checks
+        self._root_prefix = os.path.join(os.fspath(self.root_folder), '')
         self.metadata_store = metadata_store
         self.link_registry = link_registry
         self.blender_integration = blender_integration
@@ -40,51 +73,155 @@ class FileProcessor:
         
         self.scanner = FileScanner(root_folder)
         self.processed_paths: Set[str] = set()  # Avoid processing same file twice
+        self._missing_paths: Set[str] = set()  # Referenced files known not to exist
         self.output_list: List[FileEntry] = []
+        # Prefetched (metadata, external files) per blend file
+        self._blend_results: Dict[Path, Tuple[BlendFileMetadata, List[str]]] = {}
     
-    def process_stack(self, processing_stack: deque) -> List[FileEntry]:
+    def process_stack(self, processing_stack: Iterable[FileEntry]) -> List[FileEntry]:
         """
         Process the stack of files.
         
         Args:
-            processing_stack: Deque of FileEntry objects to process
+            processing_stack: FileEntry objects to process. May be a generator
+                that is still scanning: leaf and unknown files are handed to the
+                workers as they come in, blend files wait until it is exhausted
         
         Returns:
             List of processed FileEntry objects
         """
-        while processing_stack:
-            entry = processing_stack.popleft()
-            
-            # Skip if already processed
-            if str(entry.path) in self.processed_paths:
-                continue
-            
-            self.processed_paths.add(str(entry.path))
-            
-            # Check if it's a leaf node
-            if self.scanner.is_leaf_node(entry):
-                self._process_leaf_node(entry)
-            
-            # Check if it's a blend file
-            elif self.scanner.is_blend_file(entry):
-                self._process_blend_file(entry, processing_stack)
-            
-            # Other file types (unknown)
-            else:
-                self._process_unknown_file(entry)
-            
-            entry.processed = True
-            self.output_list.append(entry)
+        # Cheap files (leaf/unknown) and blend files are queued separately: cheap
+        # files are drained first, then every waiting blend file is extracted in
+        # one batch. Files the blend files link to go back into the two queues.
+        cheap_queue: deque = deque()
+        blend_queue: List[FileEntry] = []
+        
+        # Leaf and unknown files only need their own metadata. Most of it is I/O
+        # bound and read by a thread pool; decoding-heavy types go to worker
+        # processes in chunks, once there are enough of them to pay for starting
+        # the processes. Everything that touches the graph, the queues or the
+        # store stays on this thread.
+        pending: Dict[Future, List[Tuple[FileEntry, Callable[[FileEntry, Dict], None]]]] = {}
+        cpu_batch: List[Tuple[FileEntry, Callable[[FileEntry, Dict], None]]] = []
+        process_pool: Optional[ProcessPoolExecutor] = None
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                def submit(entry: FileEntry) -> None:
+                    nonlocal cpu_batch, process_pool
+                    
+                    # Skip if already processed
+                    if entry.path_str in self.processed_paths:
+                        return
+                    self.processed_paths.add(entry.path_str)
+                    
+                    if entry.flags & FLAG_LEAF:
+                        process = self._process_leaf_node
+                    else:
+                        process = self._process_unknown_file
+                    
+                    if entry.file_type in CPU_BOUND_TYPES:
+                        cpu_batch.append((entry, process))
+                        if len(cpu_batch) == PROCESS_CHUNK_SIZE:
+                            if process_pool is None:
+                                process_pool = ProcessPoolExecutor(
+                                    max_workers=min(os.cpu_count() or 1, _MAX_PROCESSES),
+                                    mp_context=_PROCESS_CONTEXT,
+                                )
+                            self._submit_batch(process_pool, cpu_batch, pending)
+                            cpu_batch = []
+                    else:
+                        self._submit_batch(executor, [(entry, process)], pending)
+                    
+                    entry.processed = True
+                    self.output_list.append(entry)
+                
+                # Start on the cheap files while the input is still coming in
+                for entry in processing_stack:
+                    if entry.flags & FLAG_BLEND:
+                        blend_queue.append(entry)
+                    else:
+                        submit(entry)
+                
+                while cheap_queue or blend_queue:
+                    while cheap_queue:
+                        submit(cheap_queue.popleft())
+                    
+                    # Write back what has finished so far, while the wave runs ahead
+                    self._write_back(pending, [f for f in pending if f.done()])
+                    
+                    # The next wave: every blend file waiting, extracted in one parallel batch
+                    wave = []
+                    for entry in blend_queue:
+                        if entry.path_str not in self.processed_paths:
+                            self.processed_paths.add(entry.path_str)
+                            wave.append(entry)
+                    blend_queue = []
+                    self._prefetch_blend_files(wave)
+                    
+                    for entry in wave:
+                        discovered: deque = deque()
+                        self._process_blend_file(entry, discovered)
+                        self._enqueue(discovered, cheap_queue, blend_queue)
+                        
+                        entry.processed = True
+                        self.output_list.append(entry)
+                
+                # Whatever is left over is too little to be worth a process
+                for item in cpu_batch:
+                    self._submit_batch(process_pool or executor, [item], pending)
+                
+                # Write the rest of the extracted metadata back as it comes in
+                self._write_back(pending, as_completed(list(pending)))
+        finally:
+            if process_pool is not None:
+                process_pool.shutdown(cancel_futures=True)
         
         return self.output_list
     
-    def _process_leaf_node(self, entry: FileEntry) -> None:
-        """Process a leaf node file (no external dependencies)."""
-        # Extract metadata
-        metadata = MetadataExtractor.extract(entry.path, entry.file_type)
+    @staticmethod
+    def _submit_batch(executor: Executor, batch: List[Tuple[FileEntry, Callable]],
+                      pending: Dict[Future, List[Tuple[FileEntry, Callable]]]) -> None:
+        """Extract the metadata of a batch of (entry, process) pairs on executor."""
+        files = [(entry.path, entry.file_type) for entry, _ in batch]
+        pending[executor.submit(_extract_batch, files)] = batch
+    
+    @staticmethod
+    def _write_back(pending: Dict[Future, List[Tuple[FileEntry, Callable]]],
+                    futures: Iterable[Future]) -> None:
+        """Hand the metadata of finished futures to their entries' process functions."""
+        for future in futures:
+            for (entry, process), metadata in zip(pending.pop(future), future.result()):
+                process(entry, metadata)
+    
+    def _enqueue(self, entries, cheap_queue: deque, blend_queue: List[FileEntry]) -> None:
+        """Sort entries into the blend file queue and the queue for everything else."""
+        for entry in entries:
+            if entry.flags & FLAG_BLEND:
+                blend_queue.append(entry)
+            else:
+                cheap_queue.append(entry)
+    
+    def _prefetch_blend_files(self, entries: List[FileEntry]) -> None:
+        """
+        Extract a batch of blend files in parallel, ahead of processing them.
+        
+        Args:
+            entries: Blend file entries about to be processed
+        """
+        if not self.blender_integration:
+            return
+        
+        blend_paths = [e.path for e in entries if e.path not in self._blend_results]
+        if blend_paths:
+            self._blend_results.update(self.blender_integration.extract_many(blend_paths))
+    
+    def _process_leaf_node(self, entry: FileEntry, metadata: Dict) -> None:
+        """Process a leaf node file (no external dependencies) given its extracted metadata."""
         entry.metadata = metadata
         
-        print(f"Processed leaf: {entry.name}", file=sys.stderr)
+        logger.info("Processed leaf: %s", entry.name)
     
     def _process_blend_file(self, entry: FileEntry, processing_stack: deque) -> None:
         """
@@ -94,90 +231,98 @@ class FileProcessor:
             entry: FileEntry for blend file
             processing_stack: Stack to add newly discovered files to
         """
-        print(f"Processing Blender file: {entry.name}", file=sys.stderr)
+        logger.info("Processing Blender file: %s", entry.name)
         
-        # Extract Blender metadata
+        # Extract Blender metadata and external dependencies
         if self.blender_integration:
-            blend_metadata = self.blender_integration.extract_blend_metadata(entry.path)
+            result = self._blend_results.pop(entry.path, None)
+            if result is None:
+                result = self.blender_integration.extract_blend_all(entry.path)
+            blend_metadata, external_files = result
             entry.metadata['blend'] = blend_metadata.to_dict()
             
-            # Extract external dependencies
-            external_files = self.blender_integration.extract_blend_dependencies(entry.path)
-            
             if external_files:
-                print(f"  Found {len(external_files)} dependencies", file=sys.stderr)
+                logger.info("  Found %d dependencies", len(external_files))
             
+            # Checked once - the per-dependency lines are the bulk of the output
+            verbose = logger.isEnabledFor(logging.INFO)
             for external_path_str in external_files:
+                # Files handled earlier in this run just need the link - no Path, no stat
+                if external_path_str in self.processed_paths:
+                    existing_entry = self.metadata_store.get_entry(external_path_str)
+                    if existing_entry:
+                        logger.info("    - %s", existing_entry.name)
+                        self.link_registry.add_link(entry.path_str, external_path_str)
+                        entry.add_link(existing_entry)
+                        continue
+                
                 external_path = Path(external_path_str)
                 
-                print(f"    - {external_path.name}", file=sys.stderr)
+                if verbose:
+                    logger.info("    - %s", external_path.name)
                 
                 # Check if we should process this file
-                if not self.follow_external and not self._is_in_root_folder(external_path):
+                if not self.follow_external and not self._is_in_root_folder(external_path_str):
                     # Just record it but don't process it
                     entry.metadata.setdefault('external_links', []).append(external_path_str)
                     continue
                 
-                # Check if file exists
-                if not external_path.exists():
-                    print(
-                        f"  Warning: External file not found: {external_path_str}",
-                        file=sys.stderr
-                    )
+                # Files that were scanned (or added) but not processed yet are already known
+                existing_entry = self.metadata_store.get_entry(external_path_str)
+                if existing_entry:
+                    # Register link to existing entry
+                    self.link_registry.add_link(entry.path_str, existing_entry.path_str)
+                    entry.add_link(existing_entry)
                     continue
                 
-                # Create entry for external file if not already processed
-                external_entry_path_str = str(external_path)
-                if external_entry_path_str not in self.processed_paths:
-                    # Check if already in metadata store
-                    existing_entry = self.metadata_store.get_entry(external_path)
-                    
-                    if not existing_entry:
-                        # Create new entry for external file
-                        external_entry = self._create_entry_for_file(external_path)
-                        if external_entry:
-                            self.metadata_store.add_entry(external_entry)
-                            processing_stack.append(external_entry)
-                            
-                            # Register link
-                            self.link_registry.add_link(str(entry.path), str(external_path))
-                            entry.add_link(external_entry)
-                    else:
-                        # Register link to existing entry
-                        self.link_registry.add_link(str(entry.path), external_entry_path_str)
-                        entry.add_link(existing_entry)
+                # Create new entry for external file
+                external_entry = self._create_entry_for_file(external_path)
+                if not external_entry:
+                    if external_path_str in self._missing_paths:
+                        logger.warning("External file not found: %s", external_path_str)
+                    continue
+                
+                self.metadata_store.add_entry(external_entry)
+                processing_stack.append(external_entry)
+                
+                # Register link
+                self.link_registry.add_link(entry.path_str, external_entry.path_str)
+                entry.add_link(external_entry)
         else:
             # Blender integration not available - still extract basic metadata
             entry.metadata['blend'] = BlendFileMetadata().to_dict()
         
-        print(f"Processed Blender file: {entry.name} ({len(entry.links)} linked files)",
-              file=sys.stderr)
+        logger.info("Processed Blender file: %s (%d linked files)", entry.name, len(entry.links))
     
-    def _process_unknown_file(self, entry: FileEntry) -> None:
-        """Process a file of unknown type."""
-        # Try to extract any available metadata
-        metadata = MetadataExtractor.extract(entry.path, entry.file_type)
+    def _process_unknown_file(self, entry: FileEntry, metadata: Dict) -> None:
+        """Process a file of unknown type given whatever metadata could be extracted."""
         entry.metadata = metadata
         
-        print(f"Processed unknown file type: {entry.name}", file=sys.stderr)
+        logger.info("Processed unknown file type: %s", entry.name)
     
-    def _is_in_root_folder(self, file_path: Path) -> bool:
+    def _is_in_root_folder(self, file_path_str: str) -> bool:
         """Check if a file path is within the root folder."""
-        try:
-            file_path.relative_to(self.root_folder)
-            return True
-        except ValueError:
-            return False
+        return file_path_str.startswith(self._root_prefix)
     
     def _create_entry_for_file(self, file_path: Path) -> Optional[FileEntry]:
-        """Create a FileEntry for a file."""
+        """Create a FileEntry for a file (None if it is missing or not a regular file)."""
+        file_path_str = str(file_path)
+        if file_path_str in self._missing_paths:
+            return None
+        
         try:
-            if not file_path.exists() or not file_path.is_file():
+            # One stat call answers "does it exist", "is it a file" and "how big"
+            try:
+                st = os.stat(file_path_str)
+            except FileNotFoundError:
+                self._missing_paths.add(file_path_str)
+                return None
+            if not stat.S_ISREG(st.st_mode):
                 return None
             
-            size = file_path.stat().st_size
-            folder = file_path.parent
-            name = file_path.name
+            size = st.st_size
+            folder_str, name = os.path.split(file_path_str)
+            folder = self.scanner.folder_path(folder_str)
             file_type = self.scanner._get_file_type(name)
             
             entry = FileEntry(
@@ -185,10 +330,11 @@ class FileProcessor:
                 folder=folder,
                 size=size,
                 file_type=file_type,
+                flags=self.scanner.file_flags(file_type),
             )
             return entry
         except (OSError, PermissionError) as e:
-            print(f"Warning: Could not create entry for {file_path}: {e}", file=sys.stderr)
+            logger.warning("Could not create entry for %s: %s", file_path, e)
             return None
     
     def get_output_list(self) -> List[FileEntry]:
@@ -1,37 +1,82 @@
 """File scanning module for Blender project documentation."""
 
+import logging
 import os
-import mimetypes
 import re
+import sys
 from pathlib import Path
-from typing import List, Tuple, Set
+from typing import Dict, Iterator, List, Tuple, Set
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
-from .data_structures import FileEntry
+from .data_structures import FLAG_BLEND, FLAG_LEAF, FileEntry
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=256)
+def _guess_type_from_mimetype(filename: str) -> str:
+    """File type for a name without extension, from the mimetypes database."""
+    import mimetypes
+    
+    mimetype, _ = mimetypes.guess_type(filename)
+    if mimetype:
+        return mimetype.split('/')[-1]
+    
+    return 'unknown'
+
+
+# Folders can be read through a file descriptor (POSIX), with stat() of the
+# entries relative to it
+_SCANDIR_FD = os.scandir in os.supports_fd and os.stat in os.supports_dir_fd
+_O_DIRECTORY = getattr(os, 'O_DIRECTORY', 0)
+
+# Blender backup files (.blend1, .blend2, etc.)
+_BLEND_BACKUP = re.compile(r'.*\.blend\d+$')
 
 
 class FileScanner:
     """Scans directories and builds initial FileEntry objects."""
     
     # File types that are leaf nodes (don't have external links we need to track)
-    LEAF_TYPES = {
+    LEAF_TYPES = frozenset({
         'jpg', 'jpeg', 'png', 'tiff', 'tif', 'exr', 'hdr', 'bmp', 'gif', 'webp',
         'mp3', 'wav', 'flac', 'aac', 'ogg', 'aiff',
         'txt', 'md', 'rst', 'csv', 'json', 'xml', 'yaml', 'yml',
         'ttf', 'otf', 'woff', 'woff2',
         'pdf', 'obj', 'fbx', 'usd', 'usda', 'glb', 'gltf',
+    })
+    
+    # Known extensions (as found on disk, lower or upper case) -> file type, so the
+    # common cases are one dict lookup returning a shared string
+    _EXT_TO_TYPE = {
+        ext: ext
+        for ext in LEAF_TYPES | {'blend', 'py', 'sh', 'bat', 'zip', 'mp4', 'mov', 'avi', 'mkv'}
     }
+    _EXT_TO_TYPE.update({ext.upper(): ext for ext in list(_EXT_TO_TYPE)})
     
     # Files to skip during scanning
-    SKIP_PATTERNS = {
+    SKIP_PATTERNS = frozenset({
         '.git', '.gitignore', '__pycache__', '.DS_Store', 'thumbs.db',
         '.pytest_cache', '.venv', 'venv', 'node_modules',
         'blender_assets.cats.txt',  # Blender asset catalog file
-    }
+    })
     
-    def __init__(self, root_folder: Path):
-        """Initialize scanner for a root folder."""
+    def __init__(self, root_folder: Path, max_workers: int = 8):
+        """
+        Initialize scanner for a root folder.
+        
+        Args:
+            root_folder: Folder to scan
+            max_workers: Number of folders read at the same time. Raise it for
+                network shares (SMB/NFS), where every directory read waits on
+                the server.
+        """
         self.root_folder = Path(root_folder)
+        self.max_workers = max_workers
+        # One shared Path object per folder, for all entries in it
+        self._folder_cache: Dict[str, Path] = {}
         if not self.root_folder.exists():
             raise FileNotFoundError(f"Folder does not exist: {self.root_folder}")
         if not self.root_folder.is_dir():
@@ -48,95 +93,161 @@ class FileScanner:
         entries = []
         processing_stack = deque()
         
-        if recursive:
-            for root, dirs, files in os.walk(self.root_folder):
-                # Filter out directories to skip
-                dirs[:] = [d for d in dirs if d not in self.SKIP_PATTERNS]
-                
-                folder_path = Path(root)
-                for filename in files:
-                    if self._should_skip(filename):
-                        continue
-                    
-                    entry = self._create_file_entry(folder_path, filename)
-                    if entry:
-                        entries.append(entry)
-                        processing_stack.append(entry)
-        else:
-            # Non-recursive: only scan root folder
-            for filename in os.listdir(self.root_folder):
-                if self._should_skip(filename):
-                    continue
-                
-                file_path = self.root_folder / filename
-                if file_path.is_file():
-                    entry = self._create_file_entry(self.root_folder, filename)
-                    if entry:
-                        entries.append(entry)
-                        processing_stack.append(entry)
+        for folder_entries in self._iter_folders(recursive):
+            entries.extend(folder_entries)
+            processing_stack.extend(folder_entries)
         
         return entries, processing_stack
     
-    def _should_skip(self, filename: str) -> bool:
-        """Check if a file should be skipped."""
-        if filename in self.SKIP_PATTERNS:
-            return True
-        if filename.startswith('.'):
-            return True
+    def iter_entries(self, recursive: bool = True) -> Iterator[FileEntry]:
+        """
+        Scan the folder, yielding FileEntry objects as soon as their folder is read.
         
-        # Skip Blender backup files (.blend1, .blend2, etc.)
-        if re.match(r'.*\.blend\d+$', filename):
-            return True
+        Same entries in the same order as scan(), but the caller can start on
+        them while the rest of the tree is still being read.
+        """
+        for folder_entries in self._iter_folders(recursive):
+            yield from folder_entries
+    
+    def _iter_folders(self, recursive: bool) -> Iterator[List[FileEntry]]:
+        """
+        Walk the root folder, yielding the file entries of each folder.
         
-        return False
+        Folders come out in the same order as os.walk (top-down, depth first),
+        but are read on a thread pool: as soon as a folder has been read, all of
+        its subfolders are queued, so many directory reads and stat calls are
+        in flight while the results are consumed in order.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            root = os.fspath(self.root_folder)
+            stack = [executor.submit(self._scan_folder, root, recursive)]
+            while stack:
+                folder_entries, subfolders = stack.pop().result()
+                stack.extend(
+                    executor.submit(self._scan_folder, subfolder, recursive)
+                    for subfolder in reversed(subfolders)
+                )
+                yield folder_entries
     
-    def _create_file_entry(self, folder: Path, filename: str) -> FileEntry | None:
-        """Create a FileEntry from a file."""
-        file_path = folder / filename
+    def _scan_folder(self, folder_str: str, recursive: bool) -> Tuple[List[FileEntry], List[str]]:
+        """
+        Read one folder.
+        
+        Uses the DirEntry objects from os.scandir, so file type and size come
+        from the directory read instead of separate stat calls per file. Paths
+        stay plain strings here; the folder's Path is built once and shared by
+        all of its entries.
+        
+        Where the platform supports it, the folder is opened once and read and
+        stat'ed through its file descriptor, so the kernel resolves each file
+        name inside the open folder instead of walking the full path again.
+        
+        Returns:
+            Tuple of (file entries, subfolders to scan)
+        """
+        folder_entries = []
+        subfolders = []
+        folder_path = None
+        skip_patterns = self.SKIP_PATTERNS
+        dir_fd = None
+        try:
+            if _SCANDIR_FD:
+                dir_fd = os.open(folder_str, os.O_RDONLY | _O_DIRECTORY)
+            with os.scandir(folder_str if dir_fd is None else dir_fd) as it:
+                for dir_entry in it:
+                    try:
+                        is_dir = dir_entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    
+                    name = dir_entry.name
+                    if not is_dir:
+                        # Skipped names, hidden files and Blender backups (.blend1, .blend2, ...)
+                        if (name[:1] == '.' or name in skip_patterns
+                                or ('.blend' in name and _BLEND_BACKUP.match(name))):
+                            continue
+                        if folder_path is None:
+                            folder_path = self.folder_path(folder_str)
+                        entry = self._create_file_entry(folder_path, dir_entry)
+                        if entry:
+                            folder_entries.append(entry)
+                    elif (recursive and name not in skip_patterns
+                          and not dir_entry.is_symlink()):
+                        subfolders.append(os.path.join(folder_str, name))
+        except OSError:
+            # Unreadable folder - skipped, like os.walk does
+            return folder_entries, []
+        finally:
+            if dir_fd is not None:
+                os.close(dir_fd)
         
+        return folder_entries, subfolders
+    
+    def _create_file_entry(self, folder: Path, dir_entry: os.DirEntry) -> FileEntry | None:
+        """Create a FileEntry from a directory entry found while scanning."""
         try:
-            if not file_path.exists() or not file_path.is_file():
+            # Both follow symlinks, like Path.is_file()/stat(); is_file() is
+            # usually answered from the directory read itself
+            if not dir_entry.is_file():
                 return None
             
-            size = file_path.stat().st_size
-            file_type = self._get_file_type(filename)
+            size = dir_entry.stat().st_size
+            file_type = self._get_file_type(dir_entry.name)
             
             entry = FileEntry(
-                name=filename,
+                name=dir_entry.name,
                 folder=folder,
                 size=size,
                 file_type=file_type,
+                flags=self.file_flags(file_type),
             )
             return entry
         
         except (OSError, PermissionError) as e:
-            print(f"Warning: Could not access file {file_path}: {e}")
+            logger.warning("Could not access file %s: %s", folder / dir_entry.name, e)
             return None
     
-    def _get_file_type(self, filename: str) -> str:
-        """Get file type from extension or mimetype."""
+    def _get_file_type(self, filename: str, guess_mimetype: bool = False) -> str:
+        """
+        Get file type from extension (or mimetype).
+        
+        Args:
+            filename: File name
+            guess_mimetype: Ask the mimetypes database about names without an
+                extension instead of reporting them as 'unknown'. It hardly ever
+                knows one, so this is off by default.
+        """
         # Try to get extension first
         _, ext = os.path.splitext(filename)
         if ext:
-            ext = ext.lstrip('.').lower()
-            return ext
-        
-        # Fall back to mimetype
-        mimetype, _ = mimetypes.guess_type(filename)
-        if mimetype:
-            return mimetype.split('/')[-1]
+            ext = ext[1:]
+            file_type = self._EXT_TO_TYPE.get(ext)
+            return file_type if file_type is not None else sys.intern(ext.lower())
         
+        if guess_mimetype:
+            return _guess_type_from_mimetype(filename)
         return 'unknown'
     
-    def is_leaf_node(self, entry: FileEntry) -> bool:
-        """Check if a file is a leaf node (no external links)."""
+    def folder_path(self, folder_str: str) -> Path:
+        """The shared Path object for a folder."""
+        folder = self._folder_cache.get(folder_str)
+        if folder is None:
+            folder = self._folder_cache.setdefault(folder_str, Path(folder_str))
+        return folder
+    
+    def file_flags(self, file_type: str) -> int:
+        """Classification bits (FileEntry.flags) for a file type."""
         # Blend files are not leaf nodes - they may have dependencies
-        if entry.file_type == 'blend':
-            return False
+        if file_type == 'blend':
+            return FLAG_BLEND
         
         # Check against known leaf types
-        return entry.file_type in self.LEAF_TYPES
+        return FLAG_LEAF if file_type in self.LEAF_TYPES else 0
+    
+    def is_leaf_node(self, entry: FileEntry) -> bool:
+        """Check if a file is a leaf node (no external links)."""
+        return bool(entry.flags & FLAG_LEAF)
     
     def is_blend_file(self, entry: FileEntry) -> bool:
         """Check if a file is a Blender file."""
-        return entry.file_type == 'blend'
+        return bool(entry.flags & FLAG_BLEND)
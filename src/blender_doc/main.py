@@ -1,8 +1,9 @@
 """Main entry point for Blender project documentation tool."""
 
+import logging
 import sys
 from pathlib import Path
-from typing import Optional, Literal
+from typing import Iterator, List, Optional, Literal
 
 from .file_scanner import FileScanner
 from .file_processor import FileProcessor
@@ -10,7 +11,9 @@ from .metadata_extractor import MetadataExtractor
 from .blender_integration import BlenderIntegration
 from .digraph_builder import DigraphBuilder
 from .pdf_exporter import PDFExporter
-from .data_structures import MetadataStore, LinkRegistry
+from .data_structures import FileEntry, MetadataStore, LinkRegistry
+
+logger = logging.getLogger(__name__)
 
 
 def process_project(
@@ -19,63 +22,65 @@ def process_project(
     output_mode: Literal['full', 'digraph_only', 'details_only'] = 'full',
     follow_external: bool = False,
     blender_path: Optional[Path] = None,
+    use_cache: bool = True,
     verbose: bool = False,
 ) -> None:
     """
     Process a Blender project and generate documentation.
     
+    Image metadata is read in worker processes that start by importing the
+    calling script, as multiprocessing's spawn method does. Scripts calling
+    this must keep their top-level code under ``if __name__ == '__main__':``.
+    
     Args:
         folder: Root folder of the project
         output_path: Path to save the PDF
         output_mode: 'full' (default), 'digraph_only', or 'details_only'
         follow_external: Whether to follow external links outside the folder
         blender_path: Optional path to Blender executable
-        verbose: Enable verbose output
+        use_cache: Reuse cached results for blend files and the digraph image
+            when they haven't changed
+        verbose: Unused, kept for compatibility. Progress is logged at INFO
+            level on the blender_doc logger; configure logging to show it
     """
     folder = Path(folder)
     output_path = Path(output_path)
     
-    if verbose:
-        print(f"Starting documentation generation...", file=sys.stderr)
-        print(f"Project folder: {folder}", file=sys.stderr)
-        print(f"Output mode: {output_mode}", file=sys.stderr)
-        print(f"Follow external links: {follow_external}", file=sys.stderr)
+    logger.info("Starting documentation generation...")
+    logger.info("Project folder: %s", folder)
+    logger.info("Output mode: %s", output_mode)
+    logger.info("Follow external links: %s", follow_external)
     
     # Initialize data structures
     metadata_store = MetadataStore()
     link_registry = LinkRegistry()
     metadata_store.set_root_folder(folder)
     
-    # Step 1: Scan filesystem
-    if verbose:
-        print("Step 1: Scanning filesystem...", file=sys.stderr)
-    
-    scanner = FileScanner(folder)
-    entries, processing_stack = scanner.scan(recursive=True)
-    
-    for entry in entries:
-        metadata_store.add_entry(entry)
-    
-    if verbose:
-        print(f"  Found {len(entries)} files", file=sys.stderr)
-    
-    # Step 2: Initialize Blender integration if available
+    # Step 1: Initialize Blender integration if available
     blender_integration = None
-    if verbose:
-        print("Step 2: Initializing Blender integration...", file=sys.stderr)
+    logger.info("Step 1: Initializing Blender integration...")
     
     try:
-        blender_integration = BlenderIntegration(str(blender_path) if blender_path else None)
-        if verbose:
-            print(f"  Blender integration available", file=sys.stderr)
+        blender_integration = BlenderIntegration(
+            str(blender_path) if blender_path else None,
+            use_cache=use_cache,
+        )
+        logger.info("  Blender integration available")
     except RuntimeError as e:
-        if verbose:
-            print(f"  Blender integration not available: {e}", file=sys.stderr)
-        print(f"Warning: {e}", file=sys.stderr)
+        logger.warning("Blender integration not available: %s", e)
+    
+    # Step 2: Scan filesystem and process files. Scanning feeds the processor
+    # directly, so metadata extraction starts with the first folder read
+    logger.info("Step 2: Scanning and processing files...")
+    
+    scanner = FileScanner(folder)
+    entries: List[FileEntry] = []
     
-    # Step 3: Process file stack
-    if verbose:
-        print("Step 3: Processing file stack...", file=sys.stderr)
+    def scanned_entries() -> Iterator[FileEntry]:
+        for entry in scanner.iter_entries(recursive=True):
+            metadata_store.add_entry(entry)
+            entries.append(entry)
+            yield entry
     
     processor = FileProcessor(
         root_folder=folder,
@@ -85,38 +90,42 @@ def process_project(
         follow_external=follow_external,
     )
     
-    output_list = processor.process_stack(processing_stack)
+    try:
+        output_list = processor.process_stack(scanned_entries())
+    finally:
+        # Shut down the persistent Blender worker once all blend files are done
+        if blender_integration:
+            blender_integration.close()
+    
+    # All links are known now - the rest of the run only reads them
+    link_registry.seal()
     
-    if verbose:
-        print(f"  Processed {len(output_list)} files", file=sys.stderr)
+    logger.info("  Found %d files", len(entries))
+    logger.info("  Processed %d files", len(output_list))
     
-    # Step 4: Build digraph
-    if verbose:
-        print("Step 4: Building dependency digraph...", file=sys.stderr)
+    # Step 3: Build digraph
+    logger.info("Step 3: Building dependency digraph...")
     
     digraph_builder = DigraphBuilder(metadata_store, link_registry)
-    digraph = digraph_builder.build_by_folder_hierarchy(folder)
+    digraph_builder.build_by_folder_hierarchy(folder)
     
     stats = digraph_builder.get_statistics()
-    if verbose:
-        print(f"  Digraph: {stats['file_count']} files, {stats['link_count']} links",
-              file=sys.stderr)
+    logger.info("  Digraph: %d files, %d links", stats['file_count'], stats['link_count'])
     
-    # Step 5: Export to PDF
-    if verbose:
-        print("Step 5: Exporting to PDF...", file=sys.stderr)
+    # Step 4: Export to PDF
+    logger.info("Step 4: Exporting to PDF...")
     
     exporter = PDFExporter(
         metadata_store=metadata_store,
         digraph_builder=digraph_builder,
         output_path=output_path,
         output_mode=output_mode,
+        use_cache=use_cache,
     )
     
     exporter.export()
     
-    if verbose:
-        print(f"Successfully generated: {output_path}", file=sys.stderr)
+    logger.info("Successfully generated: %s", output_path)
     
     # Summary
     print(f"\n=== Documentation Report ===")
@@ -1,13 +1,43 @@
 """Metadata extraction for different file types."""
 
+import importlib
+import mmap
 import os
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Callable, Dict, Optional
 
-try:
-    from PIL import Image
-except ImportError:
-    Image = None
+# Optional dependencies are imported the first time a file needs them, so
+# projects without images or compressed audio never pay for the imports.
+# A failed import is remembered as False.
+_optional_modules: Dict[str, Any] = {}
+
+# Audio file type -> (mutagen module, reader class)
+_MUTAGEN_READERS = {
+    'flac': ('mutagen.flac', 'FLAC'),
+    'mp3': ('mutagen.mp3', 'MP3'),
+    'ogg': ('mutagen.oggvorbis', 'OggVorbis'),
+}
+
+
+def _import_optional(name: str) -> Any:
+    """Import a module on first use, returning None if it is not installed."""
+    module = _optional_modules.get(name)
+    if module is None:
+        try:
+            module = importlib.import_module(name)
+        except ImportError:
+            module = False
+        _optional_modules[name] = module
+    return module or None
+
+
+def _get_image() -> Any:
+    """PIL's Image module, or None if Pillow is not installed."""
+    return _import_optional('PIL.Image')
+
+
+# Bytes of an OBJ file counted at a time
+_OBJ_CHUNK_SIZE = 16 * 1024 * 1024
 
 
 class MetadataExtractor:
@@ -25,35 +55,17 @@ class MetadataExtractor:
         Returns:
             Dictionary with metadata key-value pairs
         """
-        metadata = {}
-        
-        # Image metadata
-        if file_type in ('jpg', 'jpeg', 'png', 'tiff', 'tif', 'bmp', 'gif', 'webp'):
-            metadata = MetadataExtractor._extract_image_metadata(file_path)
-        
-        # Audio metadata
-        elif file_type in ('mp3', 'wav', 'flac', 'aac', 'ogg', 'aiff'):
-            metadata = MetadataExtractor._extract_audio_metadata(file_path)
-        
-        # Text metadata
-        elif file_type in ('txt', 'md', 'rst', 'csv', 'json', 'xml', 'yaml', 'yml'):
-            metadata = MetadataExtractor._extract_text_metadata(file_path)
-        
-        # 3D model metadata
-        elif file_type in ('obj', 'fbx', 'usd', 'usda', 'glb', 'gltf'):
-            metadata = MetadataExtractor._extract_model_metadata(file_path)
-        
-        # EXR/HDR image metadata
-        elif file_type in ('exr', 'hdr'):
-            metadata = MetadataExtractor._extract_hdr_metadata(file_path)
-        
-        return metadata
+        extractor = _EXTRACTORS.get(file_type)
+        if extractor is None:
+            return {}
+        return extractor(file_path, file_type)
     
     @staticmethod
-    def _extract_image_metadata(file_path: Path) -> Dict[str, Any]:
+    def _extract_image_metadata(file_path: Path, file_type: str) -> Dict[str, Any]:
         """Extract metadata from image files."""
         metadata = {}
         
+        Image = _get_image()
         if Image is None:
             return metadata
         
@@ -66,22 +78,37 @@ class MetadataExtractor:
                 metadata['mode'] = img.mode
                 metadata['color_space'] = img.mode
                 
-                if hasattr(img, 'n_frames'):
-                    metadata['frame_count'] = img.n_frames
+                frame_count = MetadataExtractor._frame_count(img)
+                if frame_count is not None:
+                    metadata['frame_count'] = frame_count
         except Exception as e:
             metadata['error'] = str(e)
         
         return metadata
     
     @staticmethod
-    def _extract_audio_metadata(file_path: Path) -> Dict[str, Any]:
+    def _frame_count(img) -> Optional[int]:
+        """
+        Number of frames of a multi-frame capable image, None for single-frame formats.
+        
+        n_frames walks through every frame (GIF, TIFF), so ask is_animated first,
+        which stops at the second frame.
+        """
+        if not hasattr(type(img), 'n_frames') and 'n_frames' not in vars(img):
+            return None
+        if not getattr(img, 'is_animated', True):
+            return 1
+        return img.n_frames
+    
+    @staticmethod
+    def _extract_audio_metadata(file_path: Path, file_type: str) -> Dict[str, Any]:
         """Extract metadata from audio files."""
         metadata = {}
         
         # Try to use wave module for WAV files
-        if file_path.suffix.lower() == '.wav':
+        if file_type == 'wav':
             try:
-                import wave
+                wave = _import_optional('wave')
                 with wave.open(file_path, 'rb') as wav_file:
                     n_channels = wav_file.getnchannels()
                     sample_width = wav_file.getsampwidth()
@@ -98,62 +125,49 @@ class MetadataExtractor:
         else:
             # For other audio formats, try using mutagen if available
             try:
-                from mutagen.wave import WAVE
-                from mutagen.flac import FLAC
-                from mutagen.mp3 import MP3
-                from mutagen.oggvorbis import OggVorbis
-                
-                if file_path.suffix.lower() == '.flac':
-                    audio = FLAC(file_path)
-                    if audio.info:
-                        metadata['channels'] = audio.info.channels
-                        metadata['sample_rate'] = audio.info.sample_rate
-                        metadata['duration_seconds'] = round(audio.info.length, 2)
-                elif file_path.suffix.lower() == '.mp3':
-                    audio = MP3(file_path)
-                    if audio.info:
-                        metadata['bitrate'] = audio.info.bitrate
-                        metadata['sample_rate'] = audio.info.sample_rate
-                        metadata['duration_seconds'] = round(audio.info.length, 2)
-                elif file_path.suffix.lower() == '.ogg':
-                    audio = OggVorbis(file_path)
+                # Only the mutagen module for this format is imported
+                module_name, reader_name = _MUTAGEN_READERS.get(file_type, (None, None))
+                module = _import_optional(module_name) if module_name else None
+                if module is not None:
+                    audio = getattr(module, reader_name)(file_path)
                     if audio.info:
-                        metadata['channels'] = audio.info.channels
+                        # MP3 reports its bitrate, the others their channel count
+                        first_field = 'bitrate' if file_type == 'mp3' else 'channels'
+                        metadata[first_field] = getattr(audio.info, first_field)
                         metadata['sample_rate'] = audio.info.sample_rate
                         metadata['duration_seconds'] = round(audio.info.length, 2)
-            except ImportError:
-                pass
             except Exception as e:
                 metadata['error'] = str(e)
         
         return metadata
     
     @staticmethod
-    def _extract_text_metadata(file_path: Path) -> Dict[str, Any]:
+    def _extract_text_metadata(file_path: Path, file_type: str) -> Dict[str, Any]:
         """Extract metadata from text files."""
         metadata = {}
         
         try:
+            # One pass over the lines, without holding the whole file in memory
+            line_count = 0
+            total_words = 0
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-                metadata['line_count'] = len(lines)
-                metadata['encoding'] = 'utf-8'
-                
-                # Count words (rough estimate)
-                total_words = sum(len(line.split()) for line in lines)
-                metadata['word_count'] = total_words
+                for line in f:
+                    line_count += 1
+                    total_words += len(line.split())  # rough estimate
+            
+            metadata['line_count'] = line_count
+            metadata['encoding'] = 'utf-8'
+            metadata['word_count'] = total_words
         except Exception as e:
             metadata['error'] = str(e)
         
         return metadata
     
     @staticmethod
-    def _extract_model_metadata(file_path: Path) -> Dict[str, Any]:
+    def _extract_model_metadata(file_path: Path, file_type: str) -> Dict[str, Any]:
         """Extract metadata from 3D model files."""
         metadata = {}
         
-        file_type = file_path.suffix.lower().lstrip('.')
-        
         # OBJ file metadata
         if file_type == 'obj':
             metadata = MetadataExtractor._parse_obj(file_path)
@@ -177,17 +191,35 @@ class MetadataExtractor:
             normals = 0
             textures = 0
             
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith('v '):
-                        vertices += 1
-                    elif line.startswith('vn '):
-                        normals += 1
-                    elif line.startswith('vt '):
-                        textures += 1
-                    elif line.startswith('f '):
-                        faces += 1
+            # Count line prefixes in C with bytes.count instead of a Python loop over
+            # lines. The file is memory-mapped and counted a chunk at a time, so even
+            # huge meshes are never copied into memory whole. Chunks end just before
+            # a newline, so no prefix is split between two chunks.
+            with open(file_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        # The first line has no newline in front of it
+                        head = mm[:3]
+                        vertices += head.startswith(b'v ')
+                        faces += head.startswith(b'f ')
+                        normals += head.startswith(b'vn ')
+                        textures += head.startswith(b'vt ')
+                        
+                        start = 0
+                        while start < size:
+                            end = min(start + _OBJ_CHUNK_SIZE, size)
+                            if end < size:
+                                newline = mm.rfind(b'\n', start + 1, end)
+                                if newline > start:
+                                    end = newline
+                            
+                            chunk = mm[start:end]
+                            vertices += chunk.count(b'\nv ')
+                            faces += chunk.count(b'\nf ')
+                            normals += chunk.count(b'\nvn ')
+                            textures += chunk.count(b'\nvt ')
+                            start = end
             
             metadata['vertices'] = vertices
             metadata['faces'] = faces
@@ -199,11 +231,12 @@ class MetadataExtractor:
         return metadata
     
     @staticmethod
-    def _extract_hdr_metadata(file_path: Path) -> Dict[str, Any]:
+    def _extract_hdr_metadata(file_path: Path, file_type: str) -> Dict[str, Any]:
         """Extract metadata from HDR/EXR files."""
         metadata = {}
         
         # Try using PIL for basic HDR support
+        Image = _get_image()
         if Image is not None:
             try:
                 with Image.open(file_path) as img:
@@ -215,3 +248,18 @@ class MetadataExtractor:
                 metadata['error'] = str(e)
         
         return metadata
+
+
+# File type -> extractor, called with (file_path, file_type)
+_EXTRACTORS: Dict[str, Callable[[Path, str], Dict[str, Any]]] = {}
+for _types, _extractor in (
+    (('jpg', 'jpeg', 'png', 'tiff', 'tif', 'bmp', 'gif', 'webp'),
+     MetadataExtractor._extract_image_metadata),
+    (('mp3', 'wav', 'flac', 'aac', 'ogg', 'aiff'), MetadataExtractor._extract_audio_metadata),
+    (('txt', 'md', 'rst', 'csv', 'json', 'xml', 'yaml', 'yml'),
+     MetadataExtractor._extract_text_metadata),
+    (('obj', 'fbx', 'usd', 'usda', 'glb', 'gltf'), MetadataExtractor._extract_model_metadata),
+    (('exr', 'hdr'), MetadataExtractor._extract_hdr_metadata),
+):
+    _EXTRACTORS.update(dict.fromkeys(_types, _extractor))
+del _types, _extractor
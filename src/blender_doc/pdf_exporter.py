@@ -1,35 +1,307 @@
 """PDF export functionality - generates PDF reports."""
 
+from operator import attrgetter
 from pathlib import Path
-from typing import List, Literal, Optional
+from typing import TYPE_CHECKING, List, Literal, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+import hashlib
+import importlib.util
 import io
+import os
 import tempfile
 
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib.colors import HexColor
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, PageBreak, Spacer
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import (
+    Flowable, SimpleDocTemplate, LongTable, Table, TableStyle, Paragraph, PageBreak, Spacer,
+)
 from reportlab.platypus import Image as RLImage
-import networkx as nx
-import matplotlib.pyplot as plt
+import numpy as np
 
 from .data_structures import FileEntry, MetadataStore
 from .digraph_builder import DigraphBuilder
 
+# networkx and matplotlib are slow to import, so they are only imported where
+# the digraph is drawn (details-only exports never need them)
+if TYPE_CHECKING:
+    import networkx as nx
+
 
 OutputMode = Literal['full', 'digraph_only', 'details_only']
 
+# Part of the graph image cache key - bump it whenever the rendering changes,
+# so images drawn by an older version are not reused
+_GRAPH_CACHE_VERSION = 4
+# Images kept in the graph cache; the least recently used ones are removed
+# beyond this, including any drawn by an older _GRAPH_CACHE_VERSION
+_GRAPH_CACHE_MAX_IMAGES = 32
+
+# Graphs with more nodes than this are laid out by Graphviz (sfdp) when available
+_SPRING_LAYOUT_MAX_NODES = 50
+
+# Bigger graphs are drawn with less detail: node labels and arrow heads cost a
+# text or patch artist each, and are unreadable at that density anyway
+_LABELS_MAX_NODES = 150
+_ARROWS_MAX_EDGES = 500
+
+
+def _hex_to_rgba(color: str) -> Tuple[float, float, float, float]:
+    """'#RRGGBB' as the (r, g, b, a) tuple matplotlib would parse it into."""
+    return (int(color[1:3], 16) / 255, int(color[3:5], 16) / 255, int(color[5:7], 16) / 255, 1.0)
+
+
+# Digraph node colors by file type, as RGBA tuples so matplotlib doesn't parse
+# a color string per node
+_FILE_TYPE_RGBA = {
+    file_type: _hex_to_rgba(color)
+    for file_type, color in {
+        'blend': '#FF6B35',  # Orange for blend files
+        'png': '#004E89',    # Blue for images
+        'jpg': '#004E89',
+        'jpeg': '#004E89',
+        'exr': '#004E89',
+        'hdr': '#004E89',
+        'wav': '#1F77B4',    # Light blue for audio
+        'mp3': '#1F77B4',
+        'flac': '#1F77B4',
+        'txt': '#2CA02C',    # Green for text
+        'json': '#2CA02C',
+        'csv': '#2CA02C',
+        'obj': '#9467BD',    # Purple for 3D models
+        'fbx': '#9467BD',
+        'gltf': '#9467BD',
+    }.items()
+}
+_DEFAULT_RGBA = _hex_to_rgba('#D3D3D3')
+
+# Paragraph and table styles, built once instead of on every export
+_STYLES = getSampleStyleSheet()
+_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_STYLES['Heading1'],
+    fontSize=24,
+    textColor=HexColor('#1f77b4'),
+    spaceAfter=30,
+)
+_SECTION_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_STYLES['Heading2'],
+    fontSize=18,
+    textColor=HexColor('#1f77b4'),
+    spaceAfter=20,
+)
+_FILE_TITLE_STYLE = ParagraphStyle(
+    'FileTitle',
+    parent=_STYLES['Heading3'],
+    fontSize=12,
+    textColor=HexColor('#2ca02c'),
+)
+
+# Line height in the inventory table. Its rows are plain text, so their heights
+# are known up front - lines of text times this, plus top and bottom padding
+_TABLE_LINE_HEIGHT = 12
+_INVENTORY_HEADER = ['File Name', 'Folder', 'Size (KB)', 'Type', 'Links', 'Metadata']
+_INVENTORY_HEADER_HEIGHT = _TABLE_LINE_HEIGHT + 3 + 12
+_INVENTORY_COL_WIDTHS = [1.2*inch, 1.5*inch, 0.8*inch, 0.7*inch, 0.6*inch, 2*inch]
+_INVENTORY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), HexColor('#1f77b4')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), HexColor('#ffffff')),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('LEADING', (0, 0), (-1, -1), _TABLE_LINE_HEIGHT),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), HexColor('#f0f0f0')),
+    ('GRID', (0, 0), (-1, -1), 1, HexColor('#cccccc')),
+    ('FONTSIZE', (0, 1), (-1, -1), 8),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [HexColor('#ffffff'), HexColor('#f9f9f9')]),
+])
+# Metadata shown in the inventory summary, in order: (key, format template)
+_META_FORMATS = (
+    ('dimensions', '{}'),  # image
+    ('duration_seconds', '{}s'),  # audio
+    ('channels', '{}ch'),
+    ('line_count', '{} lines'),  # text
+    ('vertices', '{} verts'),  # model
+)
+
+# Metadata summaries too wide for their column wrap in a Paragraph. The rest stay
+# plain strings, which the table draws without any text layout.
+_METADATA_STYLE = ParagraphStyle(
+    'Metadata',
+    parent=_STYLES['Normal'],
+    fontSize=8,
+    leading=_TABLE_LINE_HEIGHT,
+)
+_METADATA_WIDTH = _INVENTORY_COL_WIDTHS[-1] - 6 - 6  # minus the cell padding
+_BLEND_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), HexColor('#2ca02c')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), HexColor('#ffffff')),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('GRID', (0, 0), (-1, -1), 1, HexColor('#cccccc')),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [HexColor('#ffffff'), HexColor('#f9f9f9')]),
+])
+
+
+def _graph_cache_key(digraph: 'nx.DiGraph') -> str:
+    """Hash of everything the digraph image is drawn from (node order matters to the layout)."""
+    nodes = [
+        (node, attrs.get('file_type'), attrs.get('size'))
+        for node, attrs in digraph.nodes(data=True)
+    ]
+    key = repr((_GRAPH_CACHE_VERSION, nodes, list(digraph.edges())))
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _graph_image_format() -> str:
+    """
+    File format for the digraph image.
+    
+    SVG when svglib is installed: it is embedded as vector graphics, which
+    stay sharp when zoomed and make a smaller PDF. PNG otherwise.
+    """
+    return 'svg' if importlib.util.find_spec('svglib') is not None else 'png'
+
+
+def _graph_flowable(img_path: str) -> Optional[Flowable]:
+    """The digraph image at img_path, scaled to fit 7 x 5 inches."""
+    if not img_path.endswith('.svg'):
+        return RLImage(img_path, width=7*inch, height=5*inch, kind='proportional')
+    
+    from svglib.svglib import svg2rlg
+    
+    drawing = svg2rlg(img_path)
+    if drawing is None:
+        return None
+    scale = min(7*inch / drawing.width, 5*inch / drawing.height)
+    drawing.scale(scale, scale)
+    drawing.width *= scale
+    drawing.height *= scale
+    drawing.hAlign = 'CENTER'
+    return drawing
+
+
+def _layout_digraph(digraph: 'nx.DiGraph') -> dict:
+    """
+    Node positions for drawing the digraph.
+    
+    The networkx spring layout is a Python/NumPy loop over all node pairs per
+    iteration, which gets slow beyond a few hundred nodes. Larger graphs use
+    Graphviz's multilevel sfdp layout (needs pygraphviz) and fall back to a
+    shorter spring layout without it.
+    """
+    import networkx as nx
+    
+    if digraph.number_of_nodes() <= _SPRING_LAYOUT_MAX_NODES:
+        return nx.spring_layout(digraph, k=3, iterations=80, seed=42)
+    
+    try:
+        return nx.nx_agraph.graphviz_layout(digraph, prog='sfdp')
+    except (ImportError, OSError, ValueError):
+        # pygraphviz or the sfdp program is missing
+        return nx.spring_layout(digraph, k=3, iterations=20, seed=42)
+
+
+class _PagedTable(Flowable):
+    """
+    A long table of rows with known heights, built into a table one page at a time.
+    
+    Splitting a reportlab table copies and restyles every row that is left, at
+    each page break. This keeps the plain row data instead and only makes a
+    table of the rows that go on the current page, so pages cost the same no
+    matter how many rows follow.
+    """
+    
+    def __init__(
+        self,
+        header: List[str],
+        rows: List[List[str]],
+        header_height: float,
+        row_heights: Sequence[float],
+        col_widths: List[float],
+        style: TableStyle,
+        start: int = 0,
+    ):
+        """
+        Initialize the table.
+        
+        Args:
+            header: Header row, repeated at the top of every page
+            rows: Table rows, shared with the parts left over after splitting
+            header_height: Height of the header row
+            row_heights: Height of each row in rows
+            col_widths: Column widths
+            style: Style for each page's table, with the header as row 0
+            start: First row of rows in this part of the table
+        """
+        super().__init__()
+        self.header = header
+        self.rows = rows
+        self.header_height = header_height
+        self.row_heights = row_heights
+        self.col_widths = col_widths
+        self.style = style
+        self.start = start
+        self.hAlign = 'CENTER'  # like Table
+        self.width = sum(col_widths)
+        self.height = header_height + sum(row_heights[start:])
+    
+    def _table(self, start: int, end: int) -> LongTable:
+        """A table of the header and rows[start:end]."""
+        return LongTable(
+            [self.header] + self.rows[start:end],
+            colWidths=self.col_widths,
+            rowHeights=[self.header_height, *self.row_heights[start:end]],
+            style=self.style,
+        )
+    
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+    
+    def split(self, availWidth, availHeight):
+        # As many rows as fit below the header
+        height = self.header_height
+        end = self.start
+        for row_height in self.row_heights[self.start:]:
+            if height + row_height > availHeight:
+                break
+            height += row_height
+            end += 1
+        
+        if end == self.start:
+            return []
+        if end == len(self.rows):
+            return [self]
+        return [
+            self._table(self.start, end),
+            _PagedTable(self.header, self.rows, self.header_height, self.row_heights,
+                        self.col_widths, self.style, start=end),
+        ]
+    
+    def draw(self):
+        table = self._table(self.start, len(self.rows))
+        table.wrapOn(self.canv, self.width, self.height)
+        table.drawOn(self.canv, 0, 0)
+
 
 class PDFExporter:
     """Exports project documentation to PDF."""
     
+    DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'blender_doc' / 'graphs'
+    
     def __init__(
         self,
         metadata_store: MetadataStore,
         digraph_builder: DigraphBuilder,
         output_path: Path,
         output_mode: OutputMode = 'full',
+        use_cache: bool = True,
+        cache_dir: Optional[Path] = None,
     ):
         """
         Initialize PDF exporter.
@@ -39,16 +311,20 @@ class PDFExporter:
             digraph_builder: Builder with the digraph
             output_path: Path to save PDF
             output_mode: 'full' (default), 'digraph_only', or 'details_only'
+            use_cache: Reuse the rendered digraph image when the graph hasn't changed
+            cache_dir: Where rendered images are kept. Defaults to ~/.cache/blender_doc/graphs
         """
         self.metadata_store = metadata_store
         self.digraph_builder = digraph_builder
         self.output_path = Path(output_path)
         self.output_mode = output_mode
-        self.temp_files = []
+        self.cache_dir = Path(cache_dir or self.DEFAULT_CACHE_DIR) if use_cache else None
     
     def export(self) -> None:
         """Generate and save the PDF report."""
-        try:
+        # Uncached images go to a folder of their own, removed with everything
+        # in it when the export is done (or fails)
+        with tempfile.TemporaryDirectory(prefix='blender_doc_', ignore_cleanup_errors=True) as temp_dir:
             # Create document
             doc = SimpleDocTemplate(
                 str(self.output_path),
@@ -63,7 +339,7 @@ class PDFExporter:
             content = []
             
             if self.output_mode in ('full', 'digraph_only'):
-                content.extend(self._build_digraph_section())
+                content.extend(self._build_digraph_section(Path(temp_dir)))
             
             if self.output_mode in ('full', 'details_only'):
                 if self.output_mode == 'full':
@@ -73,116 +349,102 @@ class PDFExporter:
             # Build PDF
             doc.build(content)
             print(f"PDF exported to: {self.output_path}")
-        
-        finally:
-            # Clean up temp files
-            self._cleanup_temp_files()
     
-    def _build_digraph_section(self) -> List:
-        """Build the digraph visualization section."""
+    def _build_digraph_section(self, temp_dir: Path) -> List:
+        """
+        Build the digraph visualization section.
+        
+        Args:
+            temp_dir: Folder for the graph image when it isn't cached
+        """
         content = []
-        styles = getSampleStyleSheet()
         
         # Title
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=HexColor('#1f77b4'),
-            spaceAfter=30,
-        )
-        content.append(Paragraph('Project Dependency Graph', title_style))
+        content.append(Paragraph('Project Dependency Graph', _TITLE_STYLE))
         content.append(Spacer(1, 0.2*inch))
         
-        # Generate digraph visualization
-        digraph = self.digraph_builder.get_digraph()
-        
-        if digraph.number_of_nodes() > 0:
+        # Generate digraph visualization. An empty project has nothing to
+        # draw, and skips building (and importing) the networkx graph
+        if self.digraph_builder.node_ids:
             # Create image from digraph
-            img_path = self._render_digraph_image(digraph)
+            img_path = self._get_digraph_image(self.digraph_builder.get_digraph(), temp_dir)
             
-            if img_path:
-                # Track temp file for cleanup
-                self.temp_files.append(img_path)
-                
+            img = _graph_flowable(img_path) if img_path else None
+            if img is not None:
                 # Add image
-                img = RLImage(
-                    img_path,
-                    width=7*inch,
-                    height=5*inch,
-                    kind='proportional',
-                )
                 content.append(img)
         else:
-            content.append(Paragraph('No dependencies found', styles['Normal']))
+            content.append(Paragraph('No dependencies found', _STYLES['Normal']))
         
         # Add statistics
         content.append(Spacer(1, 0.3*inch))
-        stats = self.digraph_builder.get_statistics()
-        stats_text = f"Files: {stats['file_count']} | Links: {stats['link_count']} | " \
-                     f"Density: {stats['density']:.3f}"
-        content.append(Paragraph(stats_text, styles['Normal']))
+        stats_text = "Files: {file_count} | Links: {link_count} | Density: {density:.3f}".format_map(
+            self.digraph_builder.get_statistics()
+        )
+        content.append(Paragraph(stats_text, _STYLES['Normal']))
         
         return content
     
     def _build_details_section(self) -> List:
         """Build the file details spreadsheet section."""
         content = []
-        styles = getSampleStyleSheet()
         
         # Title
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=HexColor('#1f77b4'),
-            spaceAfter=30,
-        )
-        content.append(Paragraph('File Inventory', title_style))
+        content.append(Paragraph('File Inventory', _TITLE_STYLE))
         content.append(Spacer(1, 0.2*inch))
         
         # Build table data
         entries = self.metadata_store.get_all_entries()
         
-        table_data = [
-            ['File Name', 'Folder', 'Size (KB)', 'Type', 'Links', 'Metadata']
-        ]
+        table_data = []
+        row_heights = []
+        blend_files = []
         
-        for entry in sorted(entries, key=lambda e: str(e.path)):
+        for entry in sorted(entries, key=attrgetter('path_str')):
+            if entry.file_type == 'blend':
+                blend_files.append(entry)
+            
             # Format metadata
             metadata_summary = self._format_metadata_summary(entry)
             
             # Format size
             size_kb = entry.size / 1024 if entry.size > 0 else 0
             
+            name = entry.name
+            folder = self.metadata_store.get_relative_path(entry)
+            lines = 1 + max(name.count('\n'), folder.count('\n'))
+            height = lines * _TABLE_LINE_HEIGHT
+            
+            metadata_cell = metadata_summary
+            if stringWidth(metadata_summary, 'Helvetica', 8) > _METADATA_WIDTH:
+                metadata_cell = Paragraph(escape(metadata_summary), _METADATA_STYLE)
+                height = max(height, metadata_cell.wrap(_METADATA_WIDTH, 1e6)[1])
+            
             table_data.append([
-                entry.name,
-                self.metadata_store.get_relative_path(entry),
+                name,
+                folder,
                 f"{size_kb:.1f}",
                 entry.file_type,
                 str(len(entry.links)),
-                metadata_summary,
+                metadata_cell,
             ])
+            row_heights.append(height + 3 + 3)
         
-        # Create table
-        table = Table(table_data, colWidths=[1.2*inch, 1.5*inch, 0.8*inch, 0.7*inch, 0.6*inch, 2*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), HexColor('#1f77b4')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), HexColor('#ffffff')),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), HexColor('#f0f0f0')),
-            ('GRID', (0, 0), (-1, -1), 1, HexColor('#cccccc')),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [HexColor('#ffffff'), HexColor('#f9f9f9')]),
-        ]))
+        # Create table, with the header row repeated on every page. Split by
+        # _PagedTable, as reportlab's own splitting is quadratic in the number
+        # of rows: each page break measures and copies all rows left over.
+        table = _PagedTable(
+            _INVENTORY_HEADER,
+            table_data,
+            header_height=_INVENTORY_HEADER_HEIGHT,
+            row_heights=row_heights,
+            col_widths=_INVENTORY_COL_WIDTHS,
+            style=_INVENTORY_TABLE_STYLE,
+        )
         
         content.append(table)
         
         # Add blend file details if any exist
-        blend_files = [e for e in entries if e.file_type == 'blend']
         if blend_files:
             content.append(PageBreak())
             content.extend(self._build_blend_details_section(blend_files))
@@ -192,29 +454,15 @@ class PDFExporter:
     def _build_blend_details_section(self, blend_files: List[FileEntry]) -> List:
         """Build detailed Blender file information section."""
         content = []
-        styles = getSampleStyleSheet()
         
         # Title
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading2'],
-            fontSize=18,
-            textColor=HexColor('#1f77b4'),
-            spaceAfter=20,
-        )
-        content.append(Paragraph('Blender File Details', title_style))
+        content.append(Paragraph('Blender File Details', _SECTION_TITLE_STYLE))
         
         for blend_file in blend_files:
             content.append(Spacer(1, 0.2*inch))
             
             # File name
-            file_title = ParagraphStyle(
-                'FileTitle',
-                parent=styles['Heading3'],
-                fontSize=12,
-                textColor=HexColor('#2ca02c'),
-            )
-            content.append(Paragraph(f"File: {blend_file.name}", file_title))
+            content.append(Paragraph(f"File: {blend_file.name}", _FILE_TITLE_STYLE))
             
             # Metadata table
             blend_meta = blend_file.metadata.get('blend', {})
@@ -228,16 +476,7 @@ class PDFExporter:
                 ['Total Vertices', str(blend_meta.get('total_vertex_count', 'N/A'))],
             ]
             
-            details_table = Table(details_data, colWidths=[2*inch, 2*inch])
-            details_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), HexColor('#2ca02c')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), HexColor('#ffffff')),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('GRID', (0, 0), (-1, -1), 1, HexColor('#cccccc')),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [HexColor('#ffffff'), HexColor('#f9f9f9')]),
-            ]))
+            details_table = Table(details_data, colWidths=[2*inch, 2*inch], style=_BLEND_TABLE_STYLE)
             
             content.append(details_table)
             
@@ -248,7 +487,7 @@ class PDFExporter:
                            ", ".join([l.name for l in blend_file.links[:10]])
                 if len(blend_file.links) > 10:
                     deps_text += f" ... and {len(blend_file.links) - 10} more"
-                content.append(Paragraph(deps_text, styles['Normal']))
+                content.append(Paragraph(deps_text, _STYLES['Normal']))
         
         return content
     
@@ -257,80 +496,119 @@ class PDFExporter:
         if not entry.metadata:
             return '-'
         
-        parts = []
-        
-        # Image metadata
-        if 'dimensions' in entry.metadata:
-            parts.append(f"{entry.metadata['dimensions']}")
-        
-        # Audio metadata
-        if 'duration_seconds' in entry.metadata:
-            parts.append(f"{entry.metadata['duration_seconds']}s")
-        if 'channels' in entry.metadata:
-            parts.append(f"{entry.metadata['channels']}ch")
-        
-        # Text metadata
-        if 'line_count' in entry.metadata:
-            parts.append(f"{entry.metadata['line_count']} lines")
-        
-        # Model metadata
-        if 'vertices' in entry.metadata:
-            parts.append(f"{entry.metadata['vertices']} verts")
+        metadata = entry.metadata
+        parts = [template.format(metadata[key]) for key, template in _META_FORMATS if key in metadata]
         
         # Blend metadata
-        if 'blend' in entry.metadata:
-            blend_meta = entry.metadata['blend']
+        if 'blend' in metadata:
+            blend_meta = metadata['blend']
             if blend_meta.get('object_count'):
                 parts.append(f"{blend_meta['object_count']} objs")
         
         return ' | '.join(parts) if parts else '-'
     
-    def _render_digraph_image(self, digraph: nx.DiGraph) -> Optional[str]:
+    def _get_digraph_image(self, digraph: 'nx.DiGraph', temp_dir: Path) -> Optional[str]:
+        """
+        Get an image of the digraph, from the cache if the same graph was drawn before.
+        
+        Layout and drawing take seconds for bigger graphs, and repeated exports
+        of an unchanged project draw the same graph again.
+        
+        Args:
+            digraph: Graph to draw
+            temp_dir: Where the image is drawn when caching is off
+        
+        Returns:
+            Path to the image file, or None if rendering failed
+        """
+        img_format = _graph_image_format()
+        if self.cache_dir is not None:
+            cached_path = self.cache_dir / f"{_graph_cache_key(digraph)}.{img_format}"
+            if cached_path.exists():
+                try:
+                    os.utime(cached_path)  # mark it as recently used
+                except OSError:
+                    pass
+                return str(cached_path)
+            
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                print(f"Warning: Graph image cache unavailable: {e}")
+            else:
+                # Drawn next to its final name and moved into place in one step,
+                # so a concurrent export never sees a half-written image
+                img_path = self._render_digraph_image(digraph, self.cache_dir, img_format)
+                if img_path:
+                    os.replace(img_path, cached_path)
+                    self._prune_graph_cache()
+                    return str(cached_path)
+                return None
+        
+        return self._render_digraph_image(digraph, temp_dir, img_format)
+    
+    def _prune_graph_cache(self) -> None:
+        """Remove all but the _GRAPH_CACHE_MAX_IMAGES most recently used cached images."""
+        images = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for item in it:
+                    # Only finished images - temporary ones may still be drawn into
+                    stem, _, suffix = item.name.partition('.')
+                    if len(stem) == 32 and suffix in ('png', 'svg'):
+                        images.append((item.stat().st_mtime, item.path))
+        except OSError:
+            return
+        
+        images.sort(reverse=True)
+        for _, path in images[_GRAPH_CACHE_MAX_IMAGES:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    
+    def _render_digraph_image(self, digraph: 'nx.DiGraph', folder: Optional[Path] = None,
+                              img_format: str = 'png') -> Optional[str]:
         """
         Render the digraph as an image.
         
+        Args:
+            digraph: Graph to draw
+            folder: Where to create the image file. Defaults to the system temp folder
+            img_format: 'png' or 'svg'
+        
         Returns:
             Path to temporary image file, or None if failed
         """
+        import networkx as nx
+        from matplotlib.figure import Figure
+        
         try:
-            # Create figure
-            fig, ax = plt.subplots(figsize=(14, 10), dpi=100)
+            # Create figure. A bare Figure draws with Agg when saved to PNG and
+            # leaves pyplot (its GUI backend and figure registry) out of it
+            fig = Figure(figsize=(14, 10), dpi=100)
+            ax = fig.subplots()
             
             # Use hierarchical layout with more spacing
             if digraph.number_of_nodes() > 0:
-                pos = nx.spring_layout(digraph, k=3, iterations=80, seed=42)
+                pos = _layout_digraph(digraph)
             else:
                 pos = {}
             
             # Draw nodes with colors by file type
-            node_colors = []
-            node_sizes = []
-            file_type_colors = {
-                'blend': '#FF6B35',  # Orange for blend files
-                'png': '#004E89',    # Blue for images
-                'jpg': '#004E89',
-                'jpeg': '#004E89',
-                'exr': '#004E89',
-                'hdr': '#004E89',
-                'wav': '#1F77B4',    # Light blue for audio
-                'mp3': '#1F77B4',
-                'flac': '#1F77B4',
-                'txt': '#2CA02C',    # Green for text
-                'json': '#2CA02C',
-                'csv': '#2CA02C',
-                'obj': '#9467BD',    # Purple for 3D models
-                'fbx': '#9467BD',
-                'gltf': '#9467BD',
-            }
+            node_data = digraph.nodes(data=True)
+            node_colors = [
+                _FILE_TYPE_RGBA.get(attrs.get('file_type', 'unknown'), _DEFAULT_RGBA)
+                for _, attrs in node_data
+            ]
             
-            for node in digraph.nodes():
-                file_type = digraph.nodes[node].get('file_type', 'unknown')
-                color = file_type_colors.get(file_type, '#D3D3D3')
-                node_colors.append(color)
-                
-                # Size nodes by file size (with minimum)
-                size = max(300, digraph.nodes[node].get('size', 1000) / 10000)
-                node_sizes.append(size)
+            # Size nodes by file size (with minimum)
+            node_sizes = np.fromiter(
+                (attrs.get('size', 1000) for _, attrs in node_data),
+                dtype=np.float64,
+                count=len(node_data),
+            )
+            node_sizes = np.maximum(300, node_sizes / 10000)
             
             nx.draw_networkx_nodes(
                 digraph,
@@ -341,48 +619,53 @@ class PDFExporter:
                 ax=ax,
             )
             
-            # Draw edges
-            nx.draw_networkx_edges(
-                digraph,
-                pos,
-                edge_color='gray',
-                arrows=True,
-                arrowsize=20,
-                arrowstyle='->',
-                connectionstyle='arc3,rad=0.1',
-                ax=ax,
-                width=1.5,
-            )
+            # Draw edges - as curved arrows, or as one line collection for big graphs
+            if digraph.number_of_edges() < _ARROWS_MAX_EDGES:
+                nx.draw_networkx_edges(
+                    digraph,
+                    pos,
+                    edge_color='gray',
+                    arrows=True,
+                    arrowsize=20,
+                    arrowstyle='->',
+                    connectionstyle='arc3,rad=0.1',
+                    ax=ax,
+                    width=1.5,
+                )
+            else:
+                nx.draw_networkx_edges(
+                    digraph,
+                    pos,
+                    edge_color='gray',
+                    arrows=False,
+                    ax=ax,
+                    width=1.5,
+                )
             
             # Draw labels
-            nx.draw_networkx_labels(
-                digraph,
-                pos,
-                font_size=8,
-                font_weight='bold',
-                ax=ax,
-            )
+            if digraph.number_of_nodes() < _LABELS_MAX_NODES:
+                nx.draw_networkx_labels(
+                    digraph,
+                    pos,
+                    font_size=8,
+                    font_weight='bold',
+                    ax=ax,
+                )
             
             ax.set_title('Project Dependency Graph (File-Level)', fontsize=14, fontweight='bold')
             ax.axis('off')
             
             # Save to temp file
-            temp_file = tempfile.NamedTemporaryFile(suffix='.png', delete=False)
+            temp_file = tempfile.NamedTemporaryFile(suffix=f'.{img_format}', dir=folder, delete=False)
             temp_file.close()
             
-            fig.savefig(temp_file.name, bbox_inches='tight', dpi=100, facecolor='white')
-            plt.close(fig)
+            # Layout fitted once here; bbox_inches='tight' would draw the whole
+            # figure an extra time just to measure it
+            fig.tight_layout()
+            fig.savefig(temp_file.name, format=img_format, dpi=100, facecolor='white')
             
             return temp_file.name
         
         except Exception as e:
             print(f"Warning: Failed to render digraph image: {e}")
             return None
-    
-    def _cleanup_temp_files(self) -> None:
-        """Clean up temporary files."""
-        for temp_file in self.temp_files:
-            try:
-                Path(temp_file).unlink()
-            except Exception as e:
-                print(f"Warning: Could not delete temp file {temp_file}: {e}")
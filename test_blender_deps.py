@@ -30,13 +30,14 @@ def test_dependencies():
     for blend_file in blend_files:
         print(f"Processing: {blend_file.name}")
         
-        # Extract dependencies
-        deps = blender.extract_blend_dependencies(blend_file)
+        # Extract dependencies (printed as Blender reports them)
+        dep_count = 0
+        for dep in blender.extract_blend_dependencies(blend_file):
+            dep_count += 1
+            print(f"    - {Path(dep).name}")
         
-        if deps:
-            print(f"  Found {len(deps)} dependencies:")
-            for dep in deps:
-                print(f"    - {Path(dep).name}")
+        if dep_count:
+            print(f"  Found {dep_count} dependencies")
         else:
             print(f"  No dependencies found")
         
@@ -0,0 +1,198 @@
+"""Tests for the Blender subprocess integration, run against a stand-in Blender."""
+
+import json
+import os
+import struct
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+import blender_doc.blender_integration as blender_integration
+from blender_doc.blender_integration import (
+    BlenderIntegration, _CacheStore, _normalize_dependency,
+)
+
+pytestmark = pytest.mark.skipif(os.name != 'posix', reason="the stand-in Blender is a script")
+
+# Runs the worker script with a minimal bpy. Files written by make_blend()
+# open as empty; any other file is JSON listing the images it references,
+# or with "crash" set, makes the process exit.
+STUB_BLENDER = """#!{python}
+import json
+import os
+import sys
+import types
+
+args = sys.argv[1:]
+if '--version' in args:
+    print("Blender 5.0.0")
+    sys.exit(0)
+
+
+class Data:
+    def load(self, images=()):
+        self.objects, self.scenes, self.materials, self.meshes = [], [None], [], []
+        self.libraries, self.collections, self.actions = [], [], []
+        self.node_groups, self.curves = [], []
+        self.images = [types.SimpleNamespace(filepath=p, packed_file=None) for p in images]
+
+
+def open_mainfile(filepath):
+    with open(filepath, 'rb') as f:
+        raw = f.read()
+    if raw.startswith(b'BLENDER'):
+        bpy.data.load()
+        return
+    data = json.loads(raw)
+    if data.get('crash'):
+        os._exit(1)
+    bpy.data.load(data.get('images', []))
+
+
+bpy = types.ModuleType('bpy')
+bpy.data = Data()
+bpy.data.load()
+bpy.ops = types.SimpleNamespace(wm=types.SimpleNamespace(
+    open_mainfile=open_mainfile,
+    read_factory_settings=lambda use_empty=True: bpy.data.load(),
+))
+sys.modules['bpy'] = bpy
+
+script = args[args.index('--python-expr') + 1]
+sys.argv = ['blender'] + args
+exec(compile(script, '<worker>', 'exec'), {{'__name__': '__main__'}})
+"""
+
+
+@pytest.fixture
+def blender_exe(tmp_path: Path) -> str:
+    exe = tmp_path / 'blender'
+    exe.write_text(STUB_BLENDER.format(python=sys.executable))
+    exe.chmod(0o755)
+    return str(exe)
+
+
+def make_blend(path: Path) -> Path:
+    """Write an uncompressed .blend without libraries or images (read without Blender)."""
+    bhead = struct.Struct('<4siQii')  # code, len, old, SDNAnr, nr
+    path.write_bytes(
+        b'BLENDER-v405'
+        + bhead.pack(b'DNA1', 4, 0, 0, 1) + b'SDNA'
+        + bhead.pack(b'ENDB', 0, 0, 0, 0)
+    )
+    return path
+
+
+def make_json_blend(path: Path, images: list) -> Path:
+    path.write_text(json.dumps({'images': images}))
+    return path
+
+
+def test_batch_with_files_read_without_blender(tmp_path: Path, blender_exe: str):
+    (tmp_path / 'a.png').write_bytes(b'')
+    (tmp_path / 'c.png').write_bytes(b'')
+    a = make_json_blend(tmp_path / 'a.blend', ['//a.png'])
+    b = make_blend(tmp_path / 'b.blend')
+    c = make_json_blend(tmp_path / 'c.blend', ['//c.png'])
+    
+    blender = BlenderIntegration(blender_exe, use_cache=False)
+    results = blender.extract_many_batched([a, b, c])
+    
+    assert results[a][1] == [str((tmp_path / 'a.png').resolve())]
+    assert results[b][1] == []
+    assert results[c][1] == [str((tmp_path / 'c.png').resolve())]
+
+
+def test_cache_hit_checks_textures_again(tmp_path: Path, blender_exe: str, monkeypatch):
+    monkeypatch.setattr(_CacheStore, 'DEFAULT_PATH', tmp_path / 'cache.sqlite')
+    blend = make_json_blend(tmp_path / 'scene.blend', ['//wood.png'])
+    
+    blender = BlenderIntegration(blender_exe)
+    assert blender.extract_blend_all(blend)[1] == []
+    blender.close()
+    
+    # The texture shows up later, while the blend file stays the same
+    (tmp_path / 'wood.png').write_bytes(b'')
+    _normalize_dependency.cache_clear()  # as in a new run
+    
+    blender = BlenderIntegration(blender_exe)
+    monkeypatch.setattr(blender, '_ensure_worker', lambda: pytest.fail("cache not used"))
+    assert blender.extract_blend_all(blend)[1] == [str((tmp_path / 'wood.png').resolve())]
+    assert list(blender.extract_blend_dependencies(blend)) == [
+        str((tmp_path / 'wood.png').resolve())
+    ]
+
+
+def test_batch_continues_after_blender_crash(tmp_path: Path, blender_exe: str):
+    (tmp_path / 'a.png').write_bytes(b'')
+    (tmp_path / 'c.png').write_bytes(b'')
+    a = make_json_blend(tmp_path / 'a.blend', ['//a.png'])
+    crash = tmp_path / 'crash.blend'
+    crash.write_text(json.dumps({'crash': True}))
+    c = make_json_blend(tmp_path / 'c.blend', ['//c.png'])
+    
+    blender = BlenderIntegration(blender_exe, timeout=30, use_cache=False)
+    start = time.monotonic()
+    results = blender.extract_many_batched([a, crash, c])
+    
+    assert time.monotonic() - start < 10  # nothing waited for the timeout
+    assert results[a][1] == [str((tmp_path / 'a.png').resolve())]
+    assert results[crash][1] == []
+    assert results[c][1] == [str((tmp_path / 'c.png').resolve())]
+
+
+def test_batches_split_to_fit_the_command_line(tmp_path: Path, blender_exe: str, monkeypatch):
+    paths = []
+    for i in range(5):
+        (tmp_path / f'{i}.png').write_bytes(b'')
+        paths.append(make_json_blend(tmp_path / f'{i}.blend', [f'//{i}.png']))
+    
+    blender = BlenderIntegration(blender_exe, use_cache=False)
+    base_cmd = blender._worker_command() + ['--']
+    # Room for two paths per command line
+    monkeypatch.setattr(
+        blender_integration, '_MAX_COMMAND_LINE',
+        len(subprocess.list2cmdline(base_cmd)) + 2 * (len(str(paths[0])) + 1),
+    )
+    commands = []
+    
+    class RecordingBatch(blender_integration._BlenderBatch):
+        def __init__(self, cmd, timeout):
+            commands.append(cmd[len(base_cmd):])
+            super().__init__(cmd, timeout)
+    
+    monkeypatch.setattr(blender_integration, '_BlenderBatch', RecordingBatch)
+    results = blender.extract_many_batched(paths)
+    
+    assert [len(files) for files in commands] == [2, 2, 1]
+    for i, path in enumerate(paths):
+        assert results[path][1] == [str((tmp_path / f'{i}.png').resolve())]
+
+
+def test_extract_many_reuses_workers(tmp_path: Path, blender_exe: str, monkeypatch):
+    started = []
+    
+    class RecordingWorker(blender_integration._BlenderWorker):
+        def __init__(self, cmd, timeout):
+            started.append(self)
+            super().__init__(cmd, timeout)
+    
+    monkeypatch.setattr(blender_integration, '_BlenderWorker', RecordingWorker)
+    monkeypatch.setattr(os, 'cpu_count', lambda: 2)
+    blender = BlenderIntegration(blender_exe, use_cache=False)
+    try:
+        for wave in range(3):
+            paths = [
+                make_json_blend(tmp_path / f'{wave}-{i}.blend', []) for i in range(2)
+            ]
+            results = blender.extract_many(paths)
+            assert set(results) == set(paths)
+        blender.extract_blend_all(make_json_blend(tmp_path / 'single.blend', []))
+        
+        assert len(started) <= 2
+    finally:
+        blender.close()
+    assert not any(worker.alive for worker in started)